@@ -0,0 +1,24 @@
+"""
+asyncio helpers for driving many agent calls from one event loop.
+"""
+from __future__ import annotations
+import asyncio
+from typing import Awaitable, Iterable, List, TypeVar
+
+T = TypeVar("T")
+
+
+async def bounded_gather(aws: Iterable[Awaitable[T]], limit: int) -> List[T]:
+    """
+    Like :func:`asyncio.gather`, but at most *limit* awaitables run at once.
+    Results are returned in input order; the first exception propagates.
+    """
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return list(await asyncio.gather(*(run(aw) for aw in aws)))
@@ -1,27 +1,155 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar
 import logging
+import threading
+
+from .cache import MISSING, CacheBackend, content_key, prefix_hasher
+from .log import AgentLogger
 
 logger = logging.getLogger(__name__)
 
+#: Agent classes published with :func:`register_agent`, by name.
+AGENT_REGISTRY: Dict[str, Type["BaseAgent"]] = {}
+
+A = TypeVar("A", bound=Type["BaseAgent"])
+
+
+def register_agent(cls: Optional[A] = None, *, name: Optional[str] = None) -> Any:
+    """
+    Class decorator publishing a concrete agent in :data:`AGENT_REGISTRY`
+    under *name* (default: the class name)::
+
+        @register_agent
+        class ChatAgent(BaseAgent): ...
+    """
+    def decorate(agent_cls: A) -> A:
+        key = name or agent_cls.__name__
+        if getattr(agent_cls, "__abstractmethods__", None):
+            raise TypeError(f"cannot register abstract agent {agent_cls.__qualname__}")
+        existing = AGENT_REGISTRY.get(key)
+        if existing is not None and existing is not agent_cls:
+            raise ValueError(
+                f"agent name {key!r} already registered by {existing.__module__}.{existing.__qualname__}"
+            )
+        AGENT_REGISTRY[key] = agent_cls
+        return agent_cls
+
+    return decorate(cls) if cls is not None else decorate
+
 
 class BaseAgent(ABC):
     """
     Abstract base class for every agent in the framework.
 
-    Sub-classes MUST override :meth:`act`.
+    Sub-classes MUST override :meth:`act`.  They MAY override :meth:`aact`
+    with a native coroutine; by default it runs :meth:`act` on
+    :attr:`executor` (the loop's default executor when ``None``).
     """
 
-    def __init__(self, name: str, metadata: Dict[str, Any] | None = None) -> None:
+    executor: Optional[Executor] = None
+    _cache_prefix: Optional[tuple] = None  # (cache_config(), prefix hasher)
+
+    def __init__(
+        self,
+        name: str,
+        metadata: Dict[str, Any] | None = None,
+        *,
+        log_sample_rate: float = 1.0,
+        log_max_payload: int = 256,
+        cache: Optional[CacheBackend] = None,
+    ) -> None:
         self.name = name
         self.metadata = metadata or {}
+        self.cache = cache
+        self.log = AgentLogger(
+            logging.getLogger(type(self).__module__),
+            name,
+            sample_rate=log_sample_rate,
+            max_payload=log_max_payload,
+        )
+        if cache is not None:
+            self._install_cache(cache)
         logger.debug("Created agent '%s' with metadata=%s", self.name, self.metadata)
 
     @abstractmethod
     def act(self, input_data: Any) -> Any:  # pragma: no cover
         """Perform an action and return a result."""
         raise NotImplementedError
+
+    def act_many(self, inputs: Iterable[Any]) -> List[Any]:
+        """
+        Act on a batch of inputs, returning results in input order.
+
+        The default simply loops over :meth:`act`; sub-classes override it
+        when their tools can share work across a batch.
+        """
+        return [self.act(input_data) for input_data in inputs]
+
+    def cache_config(self) -> Any:
+        """
+        Tool configuration that influences results (hashable, stable repr).
+        It is part of every cache key, so changing it invalidates old entries.
+        """
+        return ()
+
+    def _cache_key(self, input_data: Any) -> bytes:
+        config = self.cache_config()
+        memo = self._cache_prefix
+        if memo is None or memo[0] != config:
+            memo = self._cache_prefix = (
+                config, prefix_hasher(type(self).__qualname__, self.name, config)
+            )
+        return content_key(memo[1], input_data)
+
+    def _install_cache(self, cache: CacheBackend) -> None:
+        # Shadow the bound methods on this instance only, so agents without a
+        # cache pay nothing and subclasses calling super() aren't re-cached.
+        act, act_many = self.act, self.act_many
+        local = threading.local()
+
+        def cached_act(input_data: Any) -> Any:
+            if getattr(local, "computing", False):
+                return act(input_data)
+            key = self._cache_key(input_data)
+            value = cache.get(key, MISSING)
+            if value is MISSING:
+                value = act(input_data)
+                cache.put(key, value)
+            return value
+
+        def cached_act_many(inputs: Iterable[Any]) -> List[Any]:
+            inputs = list(inputs)
+            keys = [self._cache_key(x) for x in inputs]
+            results = [cache.get(key, MISSING) for key in keys]
+            missing = [i for i, value in enumerate(results) if value is MISSING]
+            if missing:
+                local.computing = True  # the batch path may call self.act
+                try:
+                    computed = act_many([inputs[i] for i in missing])
+                finally:
+                    local.computing = False
+                for i, value in zip(missing, computed):
+                    results[i] = value
+                    cache.put(keys[i], value)
+            return results
+
+        self.act = cached_act  # type: ignore[method-assign]
+        self.act_many = cached_act_many  # type: ignore[method-assign]
+
+    async def aact(self, input_data: Any) -> Any:
+        """Async :meth:`act`; offloads the sync call so the loop stays free."""
+        import asyncio  # only async callers pay for importing it
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.act, input_data)
+
+    async def aact_many(self, inputs: Iterable[Any], limit: int = 64) -> List[Any]:
+        """Await :meth:`aact` over *inputs* with at most *limit* in flight."""
+        from .aio import bounded_gather
+
+        return await bounded_gather((self.aact(x) for x in inputs), limit)
 # auto-log 2024-01-01 9426
 # auto-log 2024-01-01 1117
 # auto-log 2024-01-01 7463
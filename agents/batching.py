@@ -0,0 +1,133 @@
+"""
+Micro-batching in front of an agent.
+
+Concurrent single-item callers are coalesced into one
+:meth:`BaseAgent.act_many` call per batch; a batch closes when it reaches
+``max_batch`` items or ``max_delay`` seconds after its first item arrived,
+whichever comes first.  Each caller gets its own result through a future.
+
+>>> coalescer = BatchCoalescer(ChatAgent("HelperBot"), max_batch=64, max_delay=0.005)
+>>> coalescer.act("hello")                       # blocking, from any thread
+>>> await coalescer.aact("hello")                # from an event loop
+"""
+from __future__ import annotations
+from concurrent.futures import Future
+from typing import Any, List, Optional, Tuple
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+from .base import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BatchCoalescer:
+    """Collect single requests into batches on a background thread."""
+
+    def __init__(self, agent: BaseAgent, max_batch: int = 64, max_delay: float = 0.005) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.agent = agent
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._closed = False
+        # Orders submit() against close(): nothing is enqueued after _STOP.
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name=f"coalescer-{agent.name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, input_data: Any) -> "Future[Any]":
+        future: "Future[Any]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchCoalescer is closed")
+            self._queue.put((input_data, future))
+        return future
+
+    def act(self, input_data: Any, timeout: Optional[float] = None) -> Any:
+        return self.submit(input_data).result(timeout)
+
+    async def aact(self, input_data: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(input_data))
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush what's queued, then stop the worker thread."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "BatchCoalescer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _collect(self) -> Tuple[List[Tuple[Any, "Future[Any]"]], bool]:
+        """Block for one batch; returns ``(batch, stop_requested)``."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = self._collect()
+            batch = [(x, f) for x, f in batch if f.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = list(self.agent.act_many([input_data for input_data, _ in batch]))
+            except Exception as exc:
+                self._fail(batch, exc)
+                continue
+            except BaseException as exc:
+                # The worker is going down: fail this batch and everything queued.
+                self._fail(batch, exc)
+                self._abandon(exc)
+                raise
+            if len(results) != len(batch):
+                self._fail(batch, RuntimeError(
+                    f"{type(self.agent).__name__}.act_many returned {len(results)} results "
+                    f"for {len(batch)} inputs"
+                ))
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Any, "Future[Any]"]], exc: BaseException) -> None:
+        for _, future in batch:
+            future.set_exception(exc)
+
+    def _abandon(self, exc: BaseException) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _STOP and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(exc)
@@ -0,0 +1,38 @@
+"""
+Opt-in memoisation of agent results.
+
+Pass ``cache=<backend>`` to any :class:`~agents.base.BaseAgent` and its
+``act`` / ``act_many`` are answered from the cache when possible.  Keys are
+a BLAKE2 hash of the agent class, agent name, the agent's
+:meth:`~agents.base.BaseAgent.cache_config` (tool configuration, e.g. the
+lexicon fingerprint) and the input, so one cache can be shared between
+agents without results leaking across them.
+
+The backends themselves live in :mod:`tools.cache` (so tools can use them
+too) and are re-exported here.
+"""
+from __future__ import annotations
+from typing import Any
+import hashlib
+
+from tools.cache import MISSING, CacheBackend, DictCache, ResultCache, SqliteCache  # noqa: F401
+
+
+def content_key(prefix: "hashlib._Hash", input_data: Any) -> bytes:
+    """Hash *input_data* on top of an agent-specific *prefix* hasher."""
+    h = prefix.copy()
+    if isinstance(input_data, str):
+        h.update(b"s")
+        h.update(input_data.encode("utf-8", "surrogatepass"))
+    else:
+        h.update(b"r")
+        h.update(f"{type(input_data).__qualname__}:{input_data!r}".encode("utf-8", "surrogatepass"))
+    return h.digest()
+
+
+def prefix_hasher(*parts: Any) -> "hashlib._Hash":
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(repr(part).encode("utf-8", "surrogatepass"))
+        h.update(b"\0")
+    return h
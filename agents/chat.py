@@ -1,25 +1,50 @@
 from __future__ import annotations
-import logging
-from .base import BaseAgent
-from tools import nlp
-
-logger = logging.getLogger(__name__)
+from typing import Iterable, List
+from .base import BaseAgent, register_agent
+from .pipeline import Pipeline, Step
+from tools.lexicon import get_lexicon
+from tools.registry import get_tool
 
 
+@register_agent
 class ChatAgent(BaseAgent):
     """
     A trivial chat-echo agent that showcases how an agent
     can orchestrate a pipeline of *tools*.
     """
 
+    # Both tools read the whitespace-collapsed text, so it is computed once.
+    pipeline = Pipeline(
+        [
+            Step("collapsed", "collapse_whitespace"),
+            Step("sentiment", "analyze_sentiment", ("collapsed",)),
+            Step("summary", "summarize_collapsed", ("collapsed",)),
+        ],
+        outputs=("sentiment", "summary"),
+    )
+
+    def cache_config(self) -> tuple:
+        return ("lexicon", get_lexicon().fingerprint)
+
     def act(self, input_data: str) -> str:
-        logger.info("ChatAgent '%s' received input: %s", self.name, input_data)
-        sentiment = nlp.analyze_sentiment(input_data)
-        summary = nlp.summarize_text(input_data)
+        self.log.info("act.received", input=input_data)
+        sentiment, summary = self.pipeline.run(input_data)
 
-        response = (
+        response = self._format(sentiment, summary)
+        self.log.debug("act.response", response=response)
+        return response
+
+    def act_many(self, inputs: Iterable[str]) -> List[str]:
+        """Run a batch through the fused sentiment + summary pipeline."""
+        texts = list(inputs)
+        self.log.info("act_many.received", size=len(texts))
+        return [
+            self._format(sentiment, summary)
+            for sentiment, summary in get_tool("analyze_and_summarize")(texts)
+        ]
+
+    def _format(self, sentiment: str, summary: str) -> str:
+        return (
             f"[{self.name}] Sentiment={sentiment} | "
             f"Summary ➜ {summary}"
         )
-        logger.debug("ChatAgent response: %s", response)
-        return response
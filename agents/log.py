@@ -0,0 +1,78 @@
+"""
+Structured, sampled, size-capped logging for agent hot paths.
+
+Every call first checks :meth:`logging.Logger.isEnabledFor` and then the
+sampling rate, so a suppressed event costs one level check and no formatting.
+Emitted events look like ``act.received agent='HelperBot' input='…'``, with
+each field value truncated to ``max_payload`` characters; the raw event name
+and fields are also attached to the record as ``event`` / ``fields``.
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict
+import logging
+import random
+
+
+def truncate(value: Any, limit: int) -> str:
+    """``repr`` of *value*, cut to at most *limit* characters of content."""
+    if isinstance(value, str) and len(value) > limit:
+        return f"{value[:limit]!r}…(+{len(value) - limit} chars)"
+    text = repr(value)
+    if len(text) > limit:
+        return f"{text[:limit]}…(+{len(text) - limit} chars)"
+    return text
+
+
+class AgentLogger:
+    """Thin wrapper around a :class:`logging.Logger` bound to one agent."""
+
+    __slots__ = ("logger", "agent", "sample_rate", "max_payload", "_random")
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        agent: str,
+        sample_rate: float = 1.0,
+        max_payload: int = 256,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate must be within [0, 1]")
+        self.logger = logger
+        self.agent = agent
+        self.sample_rate = sample_rate
+        self.max_payload = max_payload
+        self._random = rng
+
+    def enabled(self, level: int) -> bool:
+        """True when an event at *level* would be emitted (sampling included)."""
+        if not self.logger.isEnabledFor(level):
+            return False
+        return self.sample_rate >= 1.0 or self._random() < self.sample_rate
+
+    def log(self, level: int, event: str, **fields: Any) -> None:
+        if not self.enabled(level):
+            return
+        self._emit(level, event, fields)
+
+    def debug(self, event: str, **fields: Any) -> None:
+        if self.enabled(logging.DEBUG):
+            self._emit(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        if self.enabled(logging.INFO):
+            self._emit(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        if self.enabled(logging.WARNING):
+            self._emit(logging.WARNING, event, fields)
+
+    def _emit(self, level: int, event: str, fields: Dict[str, Any]) -> None:
+        limit = self.max_payload
+        rendered = {"agent": self.agent, **fields}
+        message = " ".join(
+            [event] + [f"{key}={truncate(value, limit)}" for key, value in rendered.items()]
+        )
+        self.logger.log(
+            level, "%s", message, extra={"event": event, "fields": rendered}, stacklevel=3
+        )
@@ -0,0 +1,151 @@
+"""
+Declarative tool pipelines.
+
+An agent declares its tools as a DAG of :class:`Step` s, each naming the
+upstream results it consumes (``"input"`` is the agent's input).  The
+:class:`Pipeline` only runs the steps its ``outputs`` actually depend on,
+computes every intermediate (e.g. the token list) once and hands it to all
+consumers, and groups independent steps into levels that can run
+concurrently on an executor or under asyncio::
+
+    pipeline = Pipeline(
+        [
+            Step("tokens", tokenize),
+            Step("sentiment", score_tokens, ("tokens",)),
+            Step("keywords", top_terms, ("tokens",)),
+            Step("summary", "summarize_text"),   # resolved via tools.registry
+        ],
+        outputs=("sentiment", "summary"),        # "keywords" never runs
+    )
+    sentiment, summary = pipeline.run(text)
+    sentiment, summary = await pipeline.arun(text)
+
+Without an executor steps run inline, which is cheapest for short pure
+tools; with a ``ProcessPoolExecutor`` the step functions must be picklable.
+"""
+from __future__ import annotations
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+import inspect
+
+INPUT = "input"
+
+
+class Step(NamedTuple):
+    """``name = func(*inputs)``; a string *func* is looked up in the tool registry."""
+
+    name: str
+    func: Union[str, Callable[..., Any]]
+    inputs: Tuple[str, ...] = (INPUT,)
+
+
+class Pipeline:
+    """A compiled DAG of steps producing ``outputs`` (returned as a tuple)."""
+
+    def __init__(
+        self,
+        steps: Iterable[Step],
+        outputs: Sequence[str],
+        *,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name == INPUT or step.name in self.steps:
+                raise ValueError(f"duplicate step name {step.name!r}")
+            self.steps[step.name] = step
+        self.outputs = tuple(outputs)
+        self.executor = executor
+        self.levels = self._plan()
+        self._funcs: Dict[str, Callable[..., Any]] = {}
+
+    def select(self, *outputs: str) -> "Pipeline":
+        """The same DAG pruned to *outputs*."""
+        return Pipeline(self.steps.values(), outputs, executor=self.executor)
+
+    @property
+    def plan(self) -> List[List[str]]:
+        """Step names per level; steps within a level are independent."""
+        return [[step.name for step in level] for level in self.levels]
+
+    def _plan(self) -> List[List[Step]]:
+        depth: Dict[str, int] = {INPUT: 0}
+        visiting = set()
+
+        def visit(name: str) -> int:
+            if name in depth:
+                return depth[name]
+            if name in visiting:
+                raise ValueError(f"cycle through step {name!r}")
+            try:
+                step = self.steps[name]
+            except KeyError:
+                raise ValueError(f"unknown step {name!r}") from None
+            visiting.add(name)
+            depth[name] = 1 + max((visit(dep) for dep in step.inputs), default=0)
+            visiting.discard(name)
+            return depth[name]
+
+        for name in self.outputs:
+            visit(name)
+        levels: List[List[Step]] = [[] for _ in range(max(depth.values()))]
+        for name, level in depth.items():
+            if name != INPUT:
+                levels[level - 1].append(self.steps[name])
+        return levels
+
+    def _func(self, step: Step) -> Callable[..., Any]:
+        func = self._funcs.get(step.name)
+        if func is None:
+            if isinstance(step.func, str):
+                from tools.registry import get_tool
+
+                func = get_tool(step.func)
+            else:
+                func = step.func
+            self._funcs[step.name] = func
+        return func
+
+    def run(self, value: Any) -> Tuple[Any, ...]:
+        env: Dict[str, Any] = {INPUT: value}
+        executor = self.executor
+        for level in self.levels:
+            if executor is None or len(level) == 1:
+                for step in level:
+                    env[step.name] = self._func(step)(*[env[dep] for dep in step.inputs])
+            else:
+                futures = [
+                    executor.submit(self._func(step), *[env[dep] for dep in step.inputs])
+                    for step in level
+                ]
+                for step, future in zip(level, futures):
+                    env[step.name] = future.result()
+        return tuple(env[name] for name in self.outputs)
+
+    async def arun(self, value: Any) -> Tuple[Any, ...]:
+        """
+        Async :meth:`run`: coroutine steps of a level are awaited together;
+        sync steps go to the executor, or run inline if there is none.
+        """
+        import asyncio  # only async callers pay for importing it
+
+        env: Dict[str, Any] = {INPUT: value}
+        loop = asyncio.get_running_loop()
+        for level in self.levels:
+            pending: List[Tuple[str, Any]] = []
+            for step in level:
+                func = self._func(step)
+                args = [env[dep] for dep in step.inputs]
+                if inspect.iscoroutinefunction(func):
+                    pending.append((step.name, func(*args)))
+                elif self.executor is None:
+                    env[step.name] = func(*args)
+                else:
+                    pending.append((step.name, loop.run_in_executor(self.executor, func, *args)))
+            if pending:
+                results = await asyncio.gather(*(aw for _, aw in pending))
+                env.update(zip((name for name, _ in pending), results))
+        return tuple(env[name] for name in self.outputs)
+
+    def run_many(self, values: Iterable[Any]) -> List[Tuple[Any, ...]]:
+        return [self.run(value) for value in values]
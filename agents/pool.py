@@ -0,0 +1,104 @@
+"""
+Process-pool executor for agents whose tools are CPU-bound pure Python.
+
+Each worker process builds its own agent once (via a picklable factory) and
+then serves chunks of inputs through :meth:`BaseAgent.act_many`, so the GIL
+is never shared and per-item IPC is amortised over a chunk.
+
+>>> from functools import partial
+>>> with AgentPool(partial(ChatAgent, "HelperBot"), workers=32) as pool:
+...     for response in pool.map(lines):
+...         print(response)
+"""
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional
+import logging
+import os
+
+from .base import BaseAgent
+
+logger = logging.getLogger(__name__)
+
+_worker_agent: Optional[BaseAgent] = None
+
+
+def _init_worker(factory: Callable[[], BaseAgent]) -> None:
+    global _worker_agent
+    _worker_agent = factory()
+
+
+def _act_chunk(chunk: List[Any]) -> List[Any]:
+    assert _worker_agent is not None, "worker not initialised"
+    return _worker_agent.act_many(chunk)
+
+
+class AgentPool:
+    """
+    Fan inputs out to agents living in worker processes.
+
+    :param factory: picklable zero-argument callable returning the agent,
+        e.g. ``functools.partial(ChatAgent, "HelperBot")``.
+    :param workers: number of processes (default: ``os.cpu_count()``).
+    :param chunksize: inputs sent to a worker per task.
+    :param max_in_flight: cap on submitted-but-unyielded inputs, bounding
+        memory when the consumer is slower than the pool
+        (default: ``2 * workers * chunksize``).
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], BaseAgent],
+        *,
+        workers: Optional[int] = None,
+        chunksize: int = 64,
+        max_in_flight: Optional[int] = None,
+        mp_context: Any = None,
+    ) -> None:
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.max_in_flight = max(max_in_flight or 2 * self.workers * chunksize, chunksize)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(factory,),
+        )
+        logger.debug(
+            "Started AgentPool workers=%d chunksize=%d max_in_flight=%d",
+            self.workers, self.chunksize, self.max_in_flight,
+        )
+
+    def map(self, inputs: Iterable[Any]) -> Iterator[Any]:
+        """Yield one result per input, in input order, as chunks complete."""
+        it = iter(inputs)
+        pending: Deque[Future] = deque()
+        in_flight = 0
+        exhausted = False
+
+        while True:
+            while not exhausted and in_flight + self.chunksize <= self.max_in_flight:
+                chunk = list(islice(it, self.chunksize))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.append(self._executor.submit(_act_chunk, chunk))
+                in_flight += len(chunk)
+            if not pending:
+                return
+            results = pending.popleft().result()
+            in_flight -= len(results)
+            yield from results
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "AgentPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
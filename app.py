@@ -2,23 +2,122 @@
 CLI entry-point demo.
 
 $ python app.py "Today is an awesome day!"
+$ producer | python app.py --stdin                # one response per input line
+$ python app.py --serve /tmp/agents.sock          # long-lived Unix-socket worker
+$ producer | socat - UNIX-CONNECT:/tmp/agents.sock
+$ python app.py --batch messages.jsonl -o out.jsonl  # whole files, all cores (batch.py)
+$ python app.py -- --text that starts with dashes
+
+``--stdin`` and ``--serve`` pay interpreter start-up, imports and agent
+construction once, then stream newline-delimited inputs; each response is
+written (and flushed) as soon as it is ready.
 """
-import sys
+import argparse
 import logging
+import os
+import socket
+import socketserver
+import stat
+import sys
+from functools import partial
+from typing import IO, Iterable, List, Optional
+
 from agents import ChatAgent
+from agents.base import BaseAgent
+
+AGENT_NAME = "HelperBot"
+
+
+def stream(agent: BaseAgent, lines: Iterable[str], out: IO[str]) -> None:
+    """Answer each newline-delimited input on *out*, flushing per response."""
+    for line in lines:
+        out.write(agent.act(line.rstrip("\r\n")) + "\n")
+        out.flush()
+
+
+def serve(agent: BaseAgent, path: str) -> None:
+    """Serve the newline protocol of :func:`stream` on a Unix socket."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            reader = (raw.decode("utf-8", "replace") for raw in self.rfile)
+            writer = _SocketWriter(self.wfile)
+            try:
+                stream(agent, reader, writer)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    if os.path.lexists(path):
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            raise SystemExit(f"{path} exists and is not a socket; refusing to replace it")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)  # stale socket from a previous run
+        else:
+            raise SystemExit(f"{path} is in use by a running server; refusing to replace it")
+        finally:
+            probe.close()
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        server.daemon_threads = True
+        logging.getLogger(__name__).info("Serving %s on %s", agent.name, path)
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
+
+
+class _SocketWriter:
+    def __init__(self, wfile: IO[bytes]) -> None:
+        self._wfile = wfile
+
+    def write(self, text: str) -> None:
+        self._wfile.write(text.encode("utf-8"))
+
+    def flush(self) -> None:
+        self._wfile.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the chat agent")
+    parser.add_argument("text", nargs="*", help="text to respond to (after -- if it starts with -)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--stdin", action="store_true", help="answer newline-delimited stdin")
+    mode.add_argument("--serve", metavar="SOCKET", help="serve on a Unix socket path")
+    mode.add_argument("--batch", metavar="FILE", help=".jsonl, .json, .csv or .parquet input")
+    # Defined here so building the parser doesn't import batch (and the pool).
+    options = parser.add_argument_group("batch options")
+    options.add_argument("-o", "--output", help="JSONL output path (default: stdout)")
+    options.add_argument("--field", default="text", help="record field holding the message")
+    options.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    options.add_argument("--chunksize", type=int, default=256)
+    options.add_argument("--quiet", action="store_true", help="no progress on stderr")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args(argv)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
-)
+    if args.batch:
+        if args.text:
+            parser.error("--batch takes no text arguments")
+        import batch
 
-def main() -> None:
-    if len(sys.argv) < 2:
-        raise SystemExit("Usage: python app.py <text>")
+        logging.basicConfig(level=logging.WARNING)
+        batch.run(args, partial(ChatAgent, AGENT_NAME))
+        return
 
-    text = " ".join(sys.argv[1:])
-    agent = ChatAgent("HelperBot")
-    print(agent.act(text))
+    logging.basicConfig(
+        level=args.log_level.upper(),
+        format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
+    )
+    agent = ChatAgent(AGENT_NAME)
+    if args.stdin:
+        stream(agent, sys.stdin, sys.stdout)
+    elif args.serve:
+        serve(agent, args.serve)
+    elif args.text:
+        print(agent.act(" ".join(args.text)))
+    else:
+        raise SystemExit("Usage: python app.py <text> | --stdin | --serve SOCKET | --batch FILE")
 
 
 if __name__ == "__main__":
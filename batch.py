@@ -0,0 +1,168 @@
+"""
+Streaming batch processor: run an agent over a file of messages.
+
+$ python app.py --batch messages.jsonl -o responses.jsonl --workers 8
+$ python app.py --batch messages.csv --field body        # CSV via pandas
+$ python app.py --batch messages.parquet                 # needs pyarrow installed
+
+Input is read in chunks and fanned out over an :class:`~agents.pool.AgentPool`
+(or processed in-process with ``--workers 1``); each input record is written
+back as JSONL with a ``response`` field, in input order, as soon as its
+result is ready.  Memory stays bounded by the pool's in-flight window.
+"""
+from __future__ import annotations
+from collections import deque
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, Optional
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+from agents.base import BaseAgent
+from agents.pool import AgentPool
+
+Record = Dict[str, Any]
+
+
+def read_records(path: str, chunksize: int = 10_000) -> Iterator[Record]:
+    """
+    Yield records from a ``.jsonl``/``.ndjson``, ``.json``, ``.csv`` or
+    ``.parquet`` file.  A ``.json`` file must hold an array of objects and is
+    parsed whole; the other formats are streamed.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".jsonl", ".ndjson"):
+        with open(path, encoding="utf-8") as fh:
+            for lineno, line in enumerate(fh, 1):
+                if line.strip():
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError(f"{path}:{lineno}: expected a JSON object per line")
+                    yield record
+    elif ext == ".json":
+        with open(path, encoding="utf-8") as fh:
+            records = json.load(fh)
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            raise ValueError(f"{path}: expected a JSON array of objects (or use .jsonl)")
+        yield from records
+    elif ext == ".csv":
+        import pandas as pd
+
+        for frame in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False):
+            yield from frame.to_dict("records")
+    elif ext == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading .parquet files needs pyarrow: pip install pyarrow") from None
+
+        for table in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield from table.to_pylist()
+    else:
+        raise ValueError(f"Unsupported input format {ext!r} (use .jsonl, .json, .csv or .parquet)")
+
+
+class Progress:
+    """Throttled ``rows, rows/sec`` reporter."""
+
+    def __init__(self, out: Optional[IO[str]] = sys.stderr, every: float = 1.0) -> None:
+        self.out = out
+        self.every = every
+        self.rows = 0
+        self.started = self._last = time.perf_counter()
+
+    def update(self, rows: int = 1) -> None:
+        self.rows += rows
+        now = time.perf_counter()
+        if self.out is not None and now - self._last >= self.every:
+            self._last = now
+            self.out.write(f"\r{self.rows:,} rows  {self.rate(now):,.0f} rows/s")
+            self.out.flush()
+
+    def rate(self, now: Optional[float] = None) -> float:
+        elapsed = (now or time.perf_counter()) - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def done(self) -> None:
+        if self.out is not None:
+            self.out.write(f"\r{self.rows:,} rows  {self.rate():,.0f} rows/s  done\n")
+            self.out.flush()
+
+
+def _in_process(agent: BaseAgent, texts: Iterable[str], chunksize: int) -> Iterator[Any]:
+    it = iter(texts)
+    while True:
+        chunk = list(itertools.islice(it, chunksize))
+        if not chunk:
+            return
+        yield from agent.act_many(chunk)
+
+
+def run_batch(
+    records: Iterable[Record],
+    out: IO[str],
+    factory: Callable[[], BaseAgent],
+    *,
+    field: str = "text",
+    workers: Optional[int] = None,
+    chunksize: int = 256,
+    progress: Optional[Progress] = None,
+) -> int:
+    """
+    Write each record plus its ``response`` to *out* as JSONL; returns the row
+    count.  A missing or null *field* is answered as empty text.
+    """
+    pending: Deque[Record] = deque()
+
+    def texts() -> Iterator[str]:
+        for record in records:
+            pending.append(record)
+            text = record.get(field)
+            yield "" if text is None else str(text)
+
+    pool: Optional[AgentPool] = None
+    if workers == 1:
+        results = _in_process(factory(), texts(), chunksize)
+    else:
+        pool = AgentPool(factory, workers=workers, chunksize=chunksize)
+        results = pool.map(texts())
+
+    rows = 0
+    try:
+        for response in results:
+            record = pending.popleft()
+            record["response"] = response
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            rows += 1
+            if progress is not None:
+                progress.update()
+    finally:
+        if pool is not None:
+            pool.close()
+    out.flush()
+    return rows
+
+
+def run(args: argparse.Namespace, factory: Callable[[], BaseAgent]) -> None:
+    """
+    Process ``args.batch`` with the ``app.py --batch`` options (``output``,
+    ``field``, ``workers``, ``chunksize`` and ``quiet``).
+    """
+    progress = Progress(None if args.quiet else sys.stderr)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        run_batch(
+            read_records(args.batch, chunksize=max(args.chunksize, 1_000)),
+            out,
+            factory,
+            field=args.field,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            progress=progress,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    progress.done()
@@ -0,0 +1,55 @@
+"""
+Time to rebuild a journaled scheduler after a restart.
+
+$ python benchmarks/scheduler_recovery.py [--events 1000000]
+
+Fills a fresh SQLite journal with ``--events`` pending one-shot events, then
+reopens it with each backend and reports how long ``SimpleScheduler(...)``
+takes to recover them, and the cost of the first tick.
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.scheduler import SimpleScheduler, SqliteJournal  # noqa: E402
+
+TASKS = {"noop": lambda **payload: None}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--backends", nargs="+", default=["heap", "wheel"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "journal.db")
+        journal = SqliteJournal(path, tasks=TASKS)
+        start = time.perf_counter()
+        SimpleScheduler(journal=journal).schedule_many(
+            (timedelta(seconds=60 + i % 3600), journal.task("noop", n=i))
+            for i in range(args.events)
+        )
+        journal.close()
+        print(f"wrote {args.events:,} events in {time.perf_counter() - start:.2f}s")
+
+        for backend in args.backends:
+            start = time.perf_counter()
+            journal = SqliteJournal(path, tasks=TASKS)
+            sched = SimpleScheduler(backend, journal=journal)
+            recovered = time.perf_counter() - start
+            start = time.perf_counter()
+            sched.run_pending()
+            tick = time.perf_counter() - start
+            print(f"{backend:<6} recovered {len(sched):,} in {recovered:.3f}s, first tick {tick * 1e3:.2f} ms")
+            journal.close()
+
+
+if __name__ == "__main__":
+    main()
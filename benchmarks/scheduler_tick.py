@@ -0,0 +1,69 @@
+"""
+Tick cost of the scheduler backends against the number of pending events.
+
+$ python benchmarks/scheduler_tick.py [--sizes 1000 10000 100000 1000000]
+
+For each size, the backend is filled with short-delay events spread over
+the next ``--horizon`` seconds, then time is advanced in 1 ms ticks; the
+report shows insert cost per event and mean cost per tick (including the
+events it expires).
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.scheduler.backends import BACKENDS, make_backend  # noqa: E402
+
+TICK_NS = 1_000_000
+
+
+class _Event:
+    __slots__ = ("key", "cancelled")
+
+    def __init__(self, key: int) -> None:
+        self.key = key
+        self.cancelled = False
+
+
+def bench(name: str, size: int, horizon_s: float, ticks: int) -> tuple[float, float, int]:
+    rng = random.Random(size)
+    horizon_ns = int(horizon_s * 1e9)
+    keys = [rng.randrange(horizon_ns) for _ in range(size)]
+    events = [_Event(key) for key in keys]
+    backend = make_backend(name, start=0) if name == "wheel" else make_backend(name)
+
+    start = time.perf_counter()
+    for key, event in zip(keys, events):
+        backend.push(key, event)
+    insert_ns = (time.perf_counter() - start) / size * 1e9
+
+    fired = 0
+    start = time.perf_counter()
+    for tick in range(1, ticks + 1):
+        fired += len(backend.pop_due(tick * TICK_NS))
+    tick_us = (time.perf_counter() - start) / ticks * 1e6
+    return insert_ns, tick_us, fired
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--backends", nargs="+", default=sorted(BACKENDS))
+    parser.add_argument("--horizon", type=float, default=60.0, help="seconds events are spread over")
+    parser.add_argument("--ticks", type=int, default=2_000, help="1 ms ticks to advance")
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'pending':>10} {'insert ns/ev':>13} {'tick µs':>10} {'fired':>8}")
+    for size in args.sizes:
+        for name in args.backends:
+            insert_ns, tick_us, fired = bench(name, size, args.horizon, args.ticks)
+            print(f"{name:<8} {size:>10,} {insert_ns:>13.0f} {tick_us:>10.2f} {fired:>8,}")
+
+
+if __name__ == "__main__":
+    main()
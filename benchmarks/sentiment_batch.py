@@ -0,0 +1,62 @@
+"""
+Batch sentiment labelling against a plain loop over the scalar tool.
+
+$ python benchmarks/sentiment_batch.py [--rows 200000] [--words 3 15]
+
+Rows are random sentences of ``--words`` words drawn either from neutral
+filler or from a mix where about one word in seven is a lexicon term.
+``loop`` calls :func:`analyze_sentiment` per row;
+``batch`` is :func:`analyze_sentiment_batch` on a pandas Series.
+"""
+from __future__ import annotations
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from tools.nlp import analyze_sentiment, analyze_sentiment_batch  # noqa: E402
+
+NEUTRAL = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua"
+).split()
+MIXED = NEUTRAL[:12] + ["good", "bad"]
+
+
+def make_rows(vocabulary: list[str], rows: int, words: tuple[int, int]) -> list[str]:
+    rng = random.Random(rows)
+    return [" ".join(rng.choices(vocabulary, k=rng.randint(*words))) for _ in range(rows)]
+
+
+def bench(texts: list[str]) -> tuple[float, float]:
+    start = time.perf_counter()
+    expected = [analyze_sentiment(text) for text in texts]
+    loop = time.perf_counter() - start
+
+    series = pd.Series(texts)
+    start = time.perf_counter()
+    labels = analyze_sentiment_batch(series)
+    batch = time.perf_counter() - start
+    assert list(labels) == expected
+    return loop, batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--words", type=int, nargs=2, default=(3, 15), metavar=("MIN", "MAX"))
+    args = parser.parse_args()
+
+    print(f"{'text':<8} {'rows':>8} {'loop s':>8} {'batch s':>8} {'speed-up':>9}")
+    for kind, vocabulary in (("neutral", NEUTRAL), ("mixed", MIXED)):
+        loop, batch = bench(make_rows(vocabulary, args.rows, tuple(args.words)))
+        print(f"{kind:<8} {args.rows:>8,} {loop:>8.3f} {batch:>8.3f} {loop / batch:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
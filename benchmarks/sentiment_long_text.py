@@ -0,0 +1,56 @@
+"""
+Cost of labelling long texts with a lexicon, scanned vs tokenised.
+
+$ python benchmarks/sentiment_long_text.py [--sizes 1000 12000 100000]
+
+Each text is neutral filler of the given size (the worst case: nothing to
+stop early on), optionally mixed by a positive and a negative term near the
+start.  ``scan`` is :meth:`Lexicon.polarity` on the default lexicon, which
+uses the literal-alternation fast path; ``tokens`` is the tokenising path
+every lexicon used before (and large or phrase lexicons still use).
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.lexicon import DEFAULT_LEXICON, tokenize  # noqa: E402
+
+FILLER = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud "
+    "exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. "
+)
+
+
+def make_text(size: int, mixed: bool) -> str:
+    text = (FILLER * (size // len(FILLER) + 1))[:size]
+    return "Good and bad. " + text if mixed else text
+
+
+def bench(text: str, number: int) -> tuple[float, float]:
+    lex = DEFAULT_LEXICON
+    scan = timeit.timeit(lambda: lex.polarity(text), number=number) / number
+    tokens = timeit.timeit(lambda: lex.polarity_tokens(tokenize(text)), number=number) / number
+    return scan * 1e6, tokens * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 12_000, 100_000])
+    parser.add_argument("--number", type=int, default=200, help="calls per measurement")
+    args = parser.parse_args()
+
+    print(f"{'chars':>8} {'text':<8} {'scan µs':>10} {'tokens µs':>10} {'speed-up':>9}")
+    for size in args.sizes:
+        for mixed in (False, True):
+            scan_us, tokens_us = bench(make_text(size, mixed), args.number)
+            kind = "mixed" if mixed else "neutral"
+            print(f"{size:>8,} {kind:<8} {scan_us:>10.1f} {tokens_us:>10.1f} {tokens_us / scan_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
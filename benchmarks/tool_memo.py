@@ -0,0 +1,73 @@
+"""
+Per-call cost of the pure-tool memo: off, missing and hitting.
+
+$ python benchmarks/tool_memo.py [--calls 100000]
+
+``direct`` calls the undecorated function, ``off`` the decorated tool with
+its memo disabled (the default), ``miss`` with the memo on and every input
+new, ``hit`` with the memo on and one repeated input.  ``ChatAgent.act``
+runs both tools through its pipeline, so it shows the end-to-end effect.
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import timeit
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents import ChatAgent  # noqa: E402
+from tools.nlp import analyze_sentiment, summarize_text  # noqa: E402
+
+
+def per_call_us(func: Callable[[str], Any], texts: List[str]) -> float:
+    it = iter(texts)
+    return timeit.timeit(lambda: func(next(it)), number=len(texts)) / len(texts) * 1e6
+
+
+def bench(name: str, tool: Any, call: Callable[[str], Any], calls: int) -> None:
+    fresh = [f"message {i}: the build is great but the docs are bad" for i in range(calls)]
+    same = [fresh[0]] * calls
+    row = {}
+    if hasattr(call, "__wrapped__"):
+        row["direct"] = per_call_us(call.__wrapped__, fresh)
+    row["off"] = per_call_us(call, fresh)
+    tool.cache_enable()
+    try:
+        tool.cache_clear()
+        row["miss"] = per_call_us(call, fresh)
+        tool.cache_clear()
+        row["hit"] = per_call_us(call, same)
+    finally:
+        tool.cache_enable(False)
+        tool.cache_clear()
+    cells = " ".join(f"{row[k]:>8.2f}" if k in row else f"{'-':>8}" for k in ("direct", "off", "miss", "hit"))
+    print(f"{name:<20} {cells}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'µs per call':<20} {'direct':>8} {'off':>8} {'miss':>8} {'hit':>8}")
+    bench("analyze_sentiment", analyze_sentiment, analyze_sentiment, args.calls)
+    bench("summarize_text", summarize_text, summarize_text, args.calls)
+
+    class _Both:  # toggles both memos for the agent run
+        @staticmethod
+        def cache_enable(on: bool = True) -> None:
+            analyze_sentiment.cache_enable(on)
+            summarize_text.cache_enable(on)
+
+        @staticmethod
+        def cache_clear() -> None:
+            analyze_sentiment.cache_clear()
+            summarize_text.cache_clear()
+
+    bench("ChatAgent.act", _Both, ChatAgent("Bench").act, args.calls // 4)
+
+
+if __name__ == "__main__":
+    main()
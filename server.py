@@ -0,0 +1,128 @@
+"""
+HTTP entry-point: serves every registered agent over Flask.
+
+$ flask --app server run            # or: python server.py [--host H] [--port P]
+
+POST /act        {"agent": "ChatAgent", "name": "HelperBot", "input": "..."}
+                 -> {"output": "..."}
+POST /act/batch  {"agent": "ChatAgent", "inputs": ["...", "..."]}
+                 -> {"outputs": ["...", "..."]}
+GET  /agents     -> {"agents": ["ChatAgent", ...]}
+
+Only agents published with :func:`agents.base.register_agent` are served.
+Agents are built once per (class, name) and reused across requests, keeping
+the ``max_agents`` most recently used; the batch endpoint goes through
+:meth:`BaseAgent.act_many` and takes at most ``max_batch`` strings.
+"""
+from __future__ import annotations
+import argparse
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple, Type
+
+from flask import Flask, jsonify, request
+
+import agents  # noqa: F401 – registers the bundled agents
+from agents.base import AGENT_REGISTRY, BaseAgent
+
+DEFAULT_AGENT = "ChatAgent"
+DEFAULT_NAME = "HelperBot"
+MAX_BATCH = 1000
+
+
+class AgentCache:
+    """
+    Lazily built, shared agent instances keyed by ``(class name, agent name)``.
+    Names come from clients, so only the ``max_agents`` most recently used
+    instances are kept.
+    """
+
+    def __init__(self, registry: Mapping[str, Type[BaseAgent]], max_agents: int = 256) -> None:
+        if max_agents < 1:
+            raise ValueError("max_agents must be >= 1")
+        self.registry = registry
+        self.max_agents = max_agents
+        self._agents: "OrderedDict[Tuple[str, str], BaseAgent]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def get(self, kind: str, name: str) -> BaseAgent:
+        key = (kind, name)
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is None:
+                agent = self._agents[key] = self.registry[kind](name)
+                if len(self._agents) > self.max_agents:
+                    self._agents.popitem(last=False)
+            else:
+                self._agents.move_to_end(key)
+        return agent
+
+
+def create_app(
+    registry: Optional[Mapping[str, Type[BaseAgent]]] = None,
+    max_agents: int = 256,
+    max_batch: int = MAX_BATCH,
+) -> Flask:
+    app = Flask(__name__)
+    cache = AgentCache(AGENT_REGISTRY if registry is None else registry, max_agents)
+
+    def _agent_for(payload: Dict[str, Any]) -> BaseAgent:
+        kind = payload.get("agent", DEFAULT_AGENT)
+        if kind not in cache.registry:
+            raise LookupError(kind)
+        return cache.get(kind, str(payload.get("name", DEFAULT_NAME)))
+
+    def _payload() -> Dict[str, Any]:
+        payload = request.get_json(silent=True)
+        return payload if isinstance(payload, dict) else {}
+
+    @app.errorhandler(LookupError)
+    def unknown_agent(exc: LookupError):
+        return jsonify(error=f"unknown agent {exc.args[0]!r}"), 404
+
+    @app.get("/agents")
+    def list_agents():
+        return jsonify(agents=sorted(cache.registry))
+
+    @app.post("/act")
+    def act():
+        payload = _payload()
+        text = payload.get("input")
+        if not isinstance(text, str):
+            return jsonify(error="'input' must be a string"), 400
+        return jsonify(output=_agent_for(payload).act(text))
+
+    @app.post("/act/batch")
+    def act_batch():
+        payload = _payload()
+        inputs = payload.get("inputs")
+        if not isinstance(inputs, list) or not all(isinstance(text, str) for text in inputs):
+            return jsonify(error="'inputs' must be a list of strings"), 400
+        if len(inputs) > max_batch:
+            return jsonify(error=f"at most {max_batch} inputs per batch"), 400
+        return jsonify(outputs=_agent_for(payload).act_many(inputs))
+
+    return app
+
+
+app = create_app()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve agents over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
+    )
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import io
+import json
+import os
+import pathlib
+import socket
+import subprocess
+import sys
+from functools import partial
+
+import pytest
+
+from agents import ChatAgent
+from app import main, serve, stream
+from batch import read_records, run_batch
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def test_stream_answers_each_line_in_order():
+    agent = ChatAgent("Tester")
+    out = io.StringIO()
+    stream(agent, io.StringIO("good day\r\nbad day\n\n"), out)
+    assert out.getvalue().splitlines() == [agent.act("good day"), agent.act("bad day"), agent.act("")]
+
+
+def test_serve_refuses_to_replace_a_regular_file(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("keep me")
+    with pytest.raises(SystemExit, match="not a socket"):
+        serve(ChatAgent("Tester"), str(path))
+    assert path.read_text() == "keep me"
+
+
+def test_serve_refuses_to_replace_a_live_socket(tmp_path):
+    path = str(tmp_path / "agents.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as live:
+        live.bind(path)
+        live.listen()
+        with pytest.raises(SystemExit, match="in use"):
+            serve(ChatAgent("Tester"), path)
+        assert os.path.exists(path)
+
+
+def test_run_batch_writes_responses_in_input_order(tmp_path):
+    path = tmp_path / "in.jsonl"
+    path.write_text("".join(json.dumps({"id": i, "text": f"msg {i} good"}) + "\n" for i in range(10)))
+    out = io.StringIO()
+
+    rows = run_batch(read_records(str(path)), out, partial(ChatAgent, "Tester"), workers=1, chunksize=3)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert rows == 10 and [r["id"] for r in records] == list(range(10))
+    assert records[0]["response"] == ChatAgent("Tester").act("msg 0 good")
+
+
+def test_batch_is_an_option_so_text_can_start_with_batch(tmp_path, capsys):
+    main(["batch", "jobs", "are", "awesome"])
+    assert capsys.readouterr().out.strip() == ChatAgent("HelperBot").act("batch jobs are awesome")
+
+    path, out = tmp_path / "in.json", tmp_path / "out.jsonl"
+    path.write_text(json.dumps([{"text": "good"}, {"text": "bad"}]))
+    main(["--batch", str(path), "-o", str(out), "--workers", "1", "--quiet"])
+    assert [json.loads(line)["response"] for line in out.read_text().splitlines()] == [
+        ChatAgent("HelperBot").act("good"), ChatAgent("HelperBot").act("bad")
+    ]
+
+    path.write_text('{"text": "not an array"}')
+    with pytest.raises(ValueError, match="array of objects"):
+        list(read_records(str(path)))
+
+
+def test_jsonl_records_must_be_objects_and_null_text_is_empty(tmp_path):
+    path = tmp_path / "in.jsonl"
+    path.write_text('{"text": null}\n{"id": 2}\n')
+    out = io.StringIO()
+    run_batch(read_records(str(path)), out, partial(ChatAgent, "Tester"), workers=1)
+    assert [json.loads(line)["response"] for line in out.getvalue().splitlines()] == [
+        ChatAgent("Tester").act("")
+    ] * 2
+
+    path.write_text('{"text": "ok"}\n["text"]\n')
+    with pytest.raises(ValueError, match=r"in.jsonl:2: expected a JSON object"):
+        list(read_records(str(path)))
+
+
+def test_app_imports_batch_only_for_batch_runs():
+    code = "import sys, app; assert 'batch' not in sys.modules and 'agents.pool' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
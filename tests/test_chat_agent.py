@@ -1,6 +1,221 @@
+import asyncio
+import logging
+import multiprocessing
+import pathlib
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+
 from agents import ChatAgent
+from agents.base import AGENT_REGISTRY, BaseAgent, register_agent
+from agents.batching import BatchCoalescer
+from agents.cache import DictCache, ResultCache, SqliteCache
+from agents.pipeline import Pipeline, Step
+from agents.pool import AgentPool
+from tools import nlp
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
 
 def test_chat_response_contains_summary():
     ag = ChatAgent("Tester")
     out = ag.act("Python is awesome but my IDE crashed. Bad day!")
     assert "Summary" in out
+
+
+def test_act_many_matches_act_in_order():
+    ag = ChatAgent("Tester")
+    inputs = ["What a great day", "Worst\ncommute ever " * 20, ""]
+    assert ag.act_many(inputs) == [ag.act(text) for text in inputs]
+
+
+def test_importing_agents_defers_tool_imports():
+    code = "import sys, agents; assert 'tools.nlp' not in sys.modules and 'asyncio' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+
+
+def test_aact_many_bounds_concurrency():
+    class SlowAgent(BaseAgent):
+        active = peak = 0
+
+        def act(self, input_data):
+            return input_data
+
+        async def aact(self, input_data):
+            SlowAgent.active += 1
+            SlowAgent.peak = max(SlowAgent.peak, SlowAgent.active)
+            await asyncio.sleep(0)
+            SlowAgent.active -= 1
+            return self.act(input_data)
+
+    out = asyncio.run(SlowAgent("slow").aact_many(range(50), limit=5))
+    assert out == list(range(50))
+    assert SlowAgent.peak == 5
+    assert asyncio.run(ChatAgent("Tester").aact("good")) == ChatAgent("Tester").act("good")
+
+
+def test_agent_pool_streams_results_in_order():
+    inputs = [f"message {i} is {'good' if i % 2 else 'bad'}" for i in range(25)]
+    with AgentPool(partial(ChatAgent, "Tester"), workers=2, chunksize=4, max_in_flight=8) as pool:
+        out = list(pool.map(inputs))
+    assert out == ChatAgent("Tester").act_many(inputs)
+
+
+def test_act_logging_is_truncated_and_sampled(caplog):
+    caplog.set_level(logging.INFO, logger="agents.chat")
+    ChatAgent("Tester", log_max_payload=10).act("x" * 1000)
+    (record,) = caplog.records
+    assert record.event == "act.received" and record.funcName == "act"
+    assert "(+990 chars)" in record.getMessage() and len(record.getMessage()) < 100
+
+    caplog.clear()
+    ChatAgent("Quiet", log_sample_rate=0.0).act("hello")
+    assert caplog.records == []
+
+
+def test_batch_coalescer_groups_concurrent_requests():
+    class CountingAgent(ChatAgent):
+        batches = []
+
+        def act_many(self, inputs):
+            inputs = list(inputs)
+            CountingAgent.batches.append(len(inputs))
+            return super().act_many(inputs)
+
+    inputs = [f"message {i} is good" for i in range(20)]
+    with BatchCoalescer(CountingAgent("Tester"), max_batch=8, max_delay=0.05) as coalescer:
+        futures = [coalescer.submit(text) for text in inputs]
+        out = [future.result(1) for future in futures]
+
+    assert out == [ChatAgent("Tester").act(text) for text in inputs]
+    assert sum(CountingAgent.batches) == 20 and max(CountingAgent.batches) == 8
+    assert len(CountingAgent.batches) < 20
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_batch_coalescer_fails_futures_instead_of_hanging():
+    class ShortAgent(ChatAgent):
+        def act_many(self, inputs):
+            return super().act_many(inputs)[:-1]
+
+    class DyingAgent(ChatAgent):
+        def act_many(self, inputs):
+            raise SystemExit("worker down")
+
+    with BatchCoalescer(ShortAgent("Short"), max_delay=0.05) as coalescer:
+        futures = [coalescer.submit(text) for text in ("a", "b")]
+        for future in futures:
+            with pytest.raises(RuntimeError, match="returned 1 results for 2 inputs"):
+                future.result(1)
+
+    coalescer = BatchCoalescer(DyingAgent("Dying"), max_delay=0.05)
+    futures = [coalescer.submit(text) for text in ("a", "b")]
+    for future in futures:
+        with pytest.raises(SystemExit):
+            future.result(1)
+    coalescer.close(timeout=1)
+    with pytest.raises(RuntimeError):
+        coalescer.submit("late")
+
+
+def test_result_cache_is_opt_in_and_scoped_per_agent(monkeypatch):
+    cache = ResultCache(max_entries=2)
+    alice, bob = ChatAgent("Alice", cache=cache), ChatAgent("Bob", cache=cache)
+    calls = []
+    counting = Step("sentiment", lambda text: calls.append(text) or "X")
+    pipeline = Pipeline([counting, Step("summary", nlp.summarize_text)], ("sentiment", "summary"))
+    monkeypatch.setattr(ChatAgent, "pipeline", pipeline)
+
+    assert alice.act("hi") == alice.act("hi")
+    assert bob.act("hi") != alice.act("hi")
+    assert calls == ["hi", "hi"]
+    assert cache.stats()["hits"] == 2 and len(cache) == 2
+
+    alice.act_many(["a", "b", "c"])  # LRU keeps the last two
+    assert cache.evictions == 3 and len(cache) == 2
+
+
+def test_result_cache_ttl_expires_entries():
+    now = [0.0]
+    cache = ResultCache(ttl=10, clock=lambda: now[0])
+    cache.put("k", "v")
+    assert cache.get("k") == "v"
+    now[0] = 11
+    assert cache.get("k") is None and len(cache) == 0
+
+
+def _fill_shared_cache(path):
+    ChatAgent("Worker", cache=SqliteCache(path)).act_many(["shared good", "shared bad"])
+
+
+def test_sqlite_cache_is_shared_across_processes(tmp_path):
+    path = tmp_path / "cache.db"
+    proc = multiprocessing.get_context("spawn").Process(target=_fill_shared_cache, args=(path,))
+    proc.start()
+    proc.join(30)
+
+    cache = SqliteCache(path)
+    agent = ChatAgent("Worker", cache=cache)
+    assert agent.act_many(["shared good", "shared bad"]) == ChatAgent("Worker").act_many(
+        ["shared good", "shared bad"]
+    )
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 0
+
+    cache.put(b"obj", {"n": 1})
+    assert cache.get(b"obj") == {"n": 1}
+    cache.put(b"pair", (1, 2))  # JSON by default: never unpickles shared data
+    assert cache.get(b"pair") == [1, 2]
+    assert DictCache().get("nope", "default") == "default"
+
+
+def test_pipeline_shares_intermediates_and_skips_unused_steps():
+    calls = []
+
+    def tokens(text):
+        calls.append("tokens")
+        return text.lower().split()
+
+    def unused(tokens):
+        raise AssertionError("pruned step ran")
+
+    pipeline = Pipeline(
+        [
+            Step("tokens", tokens),
+            Step("count", len, ("tokens",)),
+            Step("first", lambda toks: toks[0], ("tokens",)),
+            Step("unused", unused, ("tokens",)),
+            Step("summary", "summarize_text"),
+        ],
+        outputs=("count", "first", "summary"),
+    )
+    assert pipeline.plan == [["tokens", "summary"], ["count", "first"]]
+    assert pipeline.run("Hello Big World") == (3, "hello", "Hello Big World")
+    assert calls == ["tokens"]
+
+    with ThreadPoolExecutor(2) as pool:
+        threaded = Pipeline(pipeline.steps.values(), pipeline.outputs, executor=pool)
+        assert threaded.run("a b") == pipeline.run("a b")
+        assert asyncio.run(threaded.arun("a b")) == (2, "a", "a b")
+
+    with pytest.raises(ValueError):
+        Pipeline([Step("a", len, ("b",)), Step("b", len, ("a",))], ("a",))
+
+    text = "  Spaced   out\n\ntext, " * 30
+    assert ChatAgent.pipeline.plan == [["collapsed"], ["sentiment", "summary"]]
+    assert ChatAgent.pipeline.run(text) == (nlp.analyze_sentiment(text), nlp.summarize_text(text))
+
+
+def test_agents_are_registered_explicitly():
+    class Local(BaseAgent):
+        def act(self, input_data):
+            return input_data
+
+    assert set(AGENT_REGISTRY) == {"ChatAgent"}
+    with pytest.raises(ValueError):
+        register_agent(Local, name="ChatAgent")
+    with pytest.raises(TypeError):
+        register_agent(BaseAgent)
+    assert register_agent(ChatAgent) is ChatAgent  # re-registering is a no-op
@@ -0,0 +1,159 @@
+import io
+import itertools
+import pathlib
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from tools import analyze_sentiment, analyze_sentiment_batch
+from tools.nlp import summarize_batch, summarize_stream, summarize_text
+from tools.cache import ResultCache
+from tools.registry import ToolRegistry
+from tools.lexicon import DEFAULT_LEXICON, Lexicon, LexiconStore, tokenize
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def test_sentiment_labels():
+    assert analyze_sentiment("What an AWESOME day") == "Positive 😀"
+    assert analyze_sentiment("worst. build. ever.") == "Negative 😞"
+    assert analyze_sentiment("good news, bad news") == "Neutral 😐"
+    assert analyze_sentiment("nothing to see here") == "Neutral 😐"
+
+
+def test_mixed_sentiment_is_neutral_unless_net_weighting():
+    assert analyze_sentiment("great great but bad") == "Neutral 😐"
+    assert analyze_sentiment("love it, hate the ending, awesome cast") == "Neutral 😐"
+
+    net = Lexicon(DEFAULT_LEXICON.weights, net=True)
+    assert analyze_sentiment("great great but bad", lexicon=net) == "Positive 😀"
+    assert analyze_sentiment("good but bad and awful", lexicon=net) == "Negative 😞"
+
+
+def test_sentiment_matches_whole_words_only():
+    assert analyze_sentiment("goodbye and thanks") == "Neutral 😐"
+    assert analyze_sentiment("I wear a badge") == "Neutral 😐"
+
+
+def test_scanned_lexicon_matches_tokenised_scoring():
+    lex = Lexicon({"good": 1, "goodness": 2, "ness": -1, "bad": -1, "x_1": 3})
+    texts = [
+        "goodness gracious", "Goodness, good-ness!", "xgood bad_", "x_1 x_12 X_1",
+        "goodnessbad", "ness good", "", "GOOD" * 3, "bad " * 500 + "good",
+    ]
+    for text in texts:
+        tokens = tokenize(text)
+        assert lex.score(text) == lex.score_tokens(tokens), text
+        assert lex.polarity(text) == lex.polarity_tokens(tokens), text
+
+
+def test_weighted_lexicon_from_file(tmp_path):
+    path = tmp_path / "lexicon.txt"
+    path.write_text("# term weight\nmeh -0.5\nnot bad 2\nbad -1\n", encoding="utf-8")
+    lex = Lexicon.from_file(path)
+
+    assert len(lex) == 3 and "Not  Bad" in lex
+    assert lex.score("not bad at all") == 2.0
+    assert analyze_sentiment("meh, bad", lexicon=lex) == "Negative 😞"
+
+
+def test_lexicon_reload_swaps_active_lexicon(tmp_path):
+    path = tmp_path / "lexicon.json"
+    path.write_text('{"shiny": 1}', encoding="utf-8")
+    store = LexiconStore()
+    before = store.current
+
+    store.load(path)
+    path.write_text('{"shiny": -1}', encoding="utf-8")
+    store.reload()
+
+    assert before.score("shiny") == 0
+    assert store.current.score("shiny") == -1
+
+
+def test_batch_sentiment_matches_scalar():
+    pd = pytest.importorskip("pandas")
+    texts = ["awesome stuff", "bad and awful", "great great but bad", "", "meh"]
+    series = pd.Series(texts, index=list("abcde"), name="msg")
+
+    out = analyze_sentiment_batch(series)
+
+    assert out.dtype == "category"
+    assert list(out.index) == list("abcde") and out.name == "msg"
+    assert list(out) == [analyze_sentiment(t) for t in texts]
+    net = Lexicon(DEFAULT_LEXICON.weights, net=True)
+    assert list(analyze_sentiment_batch(texts, net)) == [analyze_sentiment(t, net) for t in texts]
+    assert list(analyze_sentiment_batch(t for t in texts)) == list(out)  # any iterable
+
+
+def test_summarize_batch_matches_textwrap_shorten():
+    texts = [
+        "short",
+        "  spaced\n\nout   words  " * 3,
+        "hyphen-ated well-known words " * 20,
+        "x" * 500 + " tail",
+        "word " * 200_000,
+    ]
+    expected = [textwrap.shorten(t.replace("\n", " "), width=40, placeholder="…") for t in texts]
+    assert summarize_batch(texts, width=40) == expected
+
+
+def test_summarize_stream_reads_only_what_it_needs():
+    text = "  streaming\n summaries   stop early " * 10
+    expected = textwrap.shorten(text.replace("\n", " "), width=30, placeholder="…")
+    endless = itertools.cycle(["  streaming\n summaries", "   stop early "])
+
+    assert summarize_stream(io.StringIO(text), width=30) == expected
+    assert summarize_stream(endless, width=30) == expected
+
+
+def test_pure_tools_are_memoised_only_when_enabled_and_bounded():
+    summarize_text.cache_clear()
+    summarize_text("alpha beta gamma", 10)
+    assert summarize_text.cache_info()["misses"] == 0  # off by default
+    summarize_text.cache_enable()
+    try:
+        assert summarize_text("alpha beta gamma", 10) == summarize_text("alpha beta gamma", 10)
+        info = summarize_text.cache_info()
+        assert info["hits"] == 1 and info["entries"] == 1
+    finally:
+        summarize_text.cache_enable(False)
+
+    memo = ResultCache(max_entries=2)
+    for k in "abc":
+        memo.put(k, k.upper())
+    assert memo.get("a") is None and memo.get("c") == "C"
+    assert memo.stats()["evictions"] == 1
+
+    big = "x" * 100_000
+    memo.put((big, "fingerprint"), "label")  # keys are sized by content
+    assert memo.stats()["bytes"] > len(big)
+
+    analyze_sentiment.cache_clear()
+    analyze_sentiment.cache_enable()
+    try:
+        analyze_sentiment(big + " good")
+        assert analyze_sentiment.cache_info()["entries"] == 0  # long texts bypass the memo
+
+        store = LexiconStore(Lexicon({"meh": 1.0}))
+        before = analyze_sentiment("meh", store.current)
+        store.set(Lexicon({"meh": -1.0}))
+        assert analyze_sentiment("meh", store.current) != before
+    finally:
+        analyze_sentiment.cache_enable(False)
+
+
+def test_tool_registry_imports_lazily():
+    code = (
+        "import sys, tools; assert 'tools.nlp' not in sys.modules; "
+        "assert tools.summarize_text('a b', 10) == 'a b'; assert 'tools.nlp' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
+
+    registry = ToolRegistry({"shorten": "textwrap:shorten"}, group=None)
+    assert not registry.is_loaded("shorten")
+    assert registry["shorten"] is textwrap.shorten and registry.is_loaded("shorten")
+    with pytest.raises(KeyError):
+        registry.get("missing")
@@ -0,0 +1,263 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+
+from tools.scheduler import (
+    AsyncSchedulerRunner,
+    CronExpression,
+    SimpleScheduler,
+    SqliteJournal,
+    ThreadedSchedulerRunner,
+    TimingWheelBackend,
+)
+
+BACKENDS = [{"backend": "heap"}, {"backend": "wheel", "resolution": 1}]
+
+
+@pytest.mark.parametrize("options", BACKENDS)
+def test_run_pending_fires_due_events_in_order(options):
+    sched = SimpleScheduler(**options)
+    fired = []
+    sched.schedule(timedelta(0), lambda: fired.append("a"))
+    sched.schedule(timedelta(hours=1), lambda: fired.append("later"))
+    sched.schedule(timedelta(0), lambda: fired.append("b"))
+    sched.schedule(timedelta(seconds=-1), lambda: fired.append("first"))
+
+    sched.run_pending()
+
+    assert fired == ["first", "a", "b"]
+    assert len(sched) == 1
+
+
+@pytest.mark.parametrize("options", BACKENDS)
+def test_cancelled_events_do_not_fire(options):
+    sched = SimpleScheduler(**options)
+    fired = []
+    handles = [sched.schedule(timedelta(0), lambda i=i: fired.append(i)) for i in range(5)]
+    assert handles[1].cancel() and handles[3].cancel()
+    assert not handles[1].cancel()
+
+    sched.run_pending()
+
+    assert fired == [0, 2, 4]
+    assert len(sched) == 0 and not handles[0].cancel()
+
+
+def test_cancel_racing_a_tick_counts_each_event_once():
+    for _ in range(20):
+        sched = SimpleScheduler()
+        fired = []
+        handles = [sched.schedule(timedelta(0), lambda i=i: fired.append(i)) for i in range(2000)]
+        cancelled = []
+        canceller = threading.Thread(target=lambda: cancelled.extend(h for h in handles if h.cancel()))
+        canceller.start()
+        while canceller.is_alive() or len(sched):
+            sched.run_pending()
+        canceller.join()
+
+        assert len(fired) + len(cancelled) == 2000 and len(sched) == 0
+
+
+def test_timing_wheel_cascades_across_levels_and_overflow():
+    class Event:
+        cancelled = False
+
+        def __init__(self, key):
+            self.key = key
+
+    wheel = TimingWheelBackend(resolution=1, levels=2, start=0)
+    keys = [5, 255, 256, 70_000, 10**9, 3, 65_535, 65_536]
+    events = {key: Event(key) for key in keys}
+    for key, event in events.items():
+        wheel.push(key, event)
+
+    fired = []
+    for now in (0, 4, 300, 70_000, 10**9 - 1, 10**9):
+        due = wheel.pop_due(now)
+        fired.append(sorted(key for key, ev in events.items() if ev in due))
+    assert fired == [[], [3], [5, 255, 256], [65_535, 65_536, 70_000], [], [10**9]]
+
+
+def test_timing_wheel_fires_past_due_and_same_tick_events_in_key_order():
+    class Event:
+        cancelled = False
+
+        def __init__(self, key):
+            self.key = key
+
+    wheel = TimingWheelBackend(resolution=10, start=1_000)
+    keys = [709_915, 709_914, 900, 500, 1_019, 1_011]
+    for key in keys:
+        wheel.push(key, Event(key))
+
+    assert [ev.key for ev in wheel.pop_due(1_000)] == [500, 900]
+    assert [ev.key for ev in wheel.pop_due(1_020)] == [1_011, 1_019]
+    assert [ev.key for ev in wheel.pop_due(710_000)] == [709_914, 709_915]
+
+
+def test_async_runner_wakes_early_and_awaits_coroutines():
+    async def main():
+        sched = SimpleScheduler()
+        runner = AsyncSchedulerRunner(sched)
+        fired = []
+
+        async def coro_callback():
+            fired.append("coro")
+            runner.stop()
+
+        sched.schedule(timedelta(hours=1), lambda: fired.append("late"))
+        task = asyncio.create_task(runner.run())
+        await asyncio.sleep(0.01)  # runner now sleeping towards the 1h event
+        sched.schedule(timedelta(milliseconds=20), lambda: fired.append("soon"))
+        sched.schedule(timedelta(milliseconds=30), coro_callback)
+        await asyncio.wait_for(task, 1)
+        await asyncio.sleep(0)
+        return fired
+
+    assert asyncio.run(main()) == ["soon", "coro"]
+
+
+def test_threaded_runner_fires_without_polling():
+    sched = SimpleScheduler()
+    done = threading.Event()
+    runner = ThreadedSchedulerRunner(sched).start()
+    try:
+        sched.schedule(timedelta(milliseconds=20), done.set)
+        assert done.wait(1)
+    finally:
+        runner.stop(timeout=1)
+
+
+def test_run_pending_collects_errors_and_keeps_going():
+    sched = SimpleScheduler()
+    fired = []
+    sched.schedule(timedelta(0), lambda: fired.append(1))
+    boom = sched.schedule(timedelta(0), lambda: 1 / 0)
+    sched.schedule(timedelta(0), lambda: fired.append(3))
+
+    report = sched.run_pending()
+
+    assert fired == [1, 3] and report.fired == 3
+    assert [(event, type(exc)) for event, exc in report.errors] == [(boom, ZeroDivisionError)]
+    assert report.latency >= 0
+
+
+def test_run_pending_on_executor_caps_callback_time():
+    release = threading.Event()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        sched = SimpleScheduler(executor=pool, callback_timeout=0.05)
+        slow = sched.schedule(timedelta(0), lambda: release.wait(5))
+        sched.schedule(timedelta(0), lambda: None)
+
+        report = sched.run_pending()
+        release.set()
+
+    assert report.timed_out == [slow] and report.errors == []
+    assert report.latency < 1
+
+
+def test_executor_timeout_is_per_callback_and_defers_queued_ones():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        sched = SimpleScheduler(executor=pool, callback_timeout=0.05)
+        ran = []
+        for i in range(3):
+            sched.schedule(timedelta(0), lambda i=i: time.sleep(0.04) or ran.append(i))
+        report = sched.run_pending()
+        assert ran == [0, 1, 2] and report.fired == 3
+        assert report.timed_out == [] and report.deferred == []
+
+        release = threading.Event()
+        hung = sched.schedule(timedelta(0), lambda: release.wait(5))
+        queued = sched.schedule(timedelta(0), lambda: ran.append("queued"))
+        report = sched.run_pending()
+        assert report.timed_out == [hung] and report.deferred == [queued]
+        assert report.fired == 1 and len(sched) == 1
+        release.set()
+
+        assert sched.run_pending().fired == 1
+        pool.shutdown(wait=True)
+        assert ran[-1] == "queued" and len(sched) == 0
+
+
+def test_async_runner_does_not_block_loop_on_executor_callbacks():
+    release = threading.Event()
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            sched = SimpleScheduler(executor=pool)
+            runner = AsyncSchedulerRunner(sched)
+            task = asyncio.create_task(runner.run())
+            sched.schedule(timedelta(0), lambda: release.wait(5))
+            started = time.monotonic()
+            await asyncio.sleep(0.05)
+            assert time.monotonic() - started < 1  # loop not blocked meanwhile
+            release.set()
+            runner.stop()
+            await asyncio.wait_for(task, 1)
+
+    asyncio.run(main())
+
+
+def test_schedule_many_uses_one_clock_reading():
+    sched = SimpleScheduler()
+    events = sched.schedule_many([(timedelta(seconds=s), lambda: None) for s in (3, 1, 2)])
+
+    assert [b.key - a.key for a, b in zip(events, events[1:])] == [-2 * 10**9, 10**9]
+    assert len(sched) == 3
+    assert abs((sched.next_due() - events[1].due).total_seconds()) < 0.01
+
+
+@pytest.mark.parametrize("options", BACKENDS)
+def test_recurring_job_reuses_its_event_until_cancelled(options):
+    sched = SimpleScheduler(**options)
+    fired = []
+    job = sched.schedule_every(timedelta(milliseconds=1), lambda: fired.append(job.key), first=timedelta(0))
+
+    for _ in range(3):
+        sched.run_pending()
+        time.sleep(0.002)
+    assert len(fired) == 3 and len(set(fired)) == 3 and len(sched) == 1
+
+    job.cancel()
+    time.sleep(0.002)
+    sched.run_pending()
+    assert len(fired) == 3 and len(sched) == 0
+
+
+def test_cron_expression_next_fire():
+    expr = CronExpression.parse("30 9 * * mon-fri")
+    assert CronExpression.parse("30 9 * * mon-fri") is expr
+    assert expr.next_after(datetime(2024, 3, 1, 9, 30)) == datetime(2024, 3, 4, 9, 30)
+    assert CronExpression("@monthly").next_after(datetime(2024, 1, 31, 12)) == datetime(2024, 2, 1)
+    with pytest.raises(ValueError):
+        CronExpression("61 * * * *")
+
+
+def test_journal_recovers_pending_events_after_restart(tmp_path):
+    calls = []
+    tasks = {"remind": lambda user: calls.append(user)}
+
+    journal = SqliteJournal(tmp_path / "sched.db", tasks=tasks)
+    sched = SimpleScheduler(journal=journal)
+    sched.schedule(timedelta(seconds=-1), journal.task("remind", user=1))
+    sched.schedule(timedelta(hours=1), journal.task("remind", user=2))
+    sched.schedule(timedelta(hours=2), journal.task("remind", user=3)).cancel()
+    sched.schedule(timedelta(seconds=-1), lambda: calls.append("not persisted"))
+    sched.schedule_every(timedelta(minutes=5), journal.task("remind", user=4))
+    journal.close()  # "crash" before anything ran
+
+    journal = SqliteJournal(tmp_path / "sched.db", tasks=tasks)
+    sched = SimpleScheduler(journal=journal)
+    assert len(sched) == 3
+    sched.schedule(timedelta(seconds=-5), lambda: calls.append("new but earlier"))
+    sched.run_pending()
+    assert calls == ["new but earlier", 1] and len(sched) == 2
+    journal.close()
+
+    journal = SqliteJournal(tmp_path / "sched.db", tasks=tasks)
+    assert len(SimpleScheduler(journal=journal)) == 2
+    journal.close()
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("flask")
+
+from agents import ChatAgent  # noqa: E402
+from server import AgentCache, create_app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    return create_app({"ChatAgent": ChatAgent}).test_client()
+
+
+def test_act_and_batch_endpoints(client):
+    single = client.post("/act", json={"name": "Web", "input": "great stuff"})
+    batch = client.post("/act/batch", json={"name": "Web", "inputs": ["great stuff", "bad"]})
+
+    assert single.status_code == batch.status_code == 200
+    assert batch.get_json()["outputs"] == ChatAgent("Web").act_many(["great stuff", "bad"])
+    assert single.get_json()["output"] == batch.get_json()["outputs"][0]
+
+
+def test_bad_requests(client):
+    assert client.post("/act", json={"agent": "Nope", "input": "x"}).status_code == 404
+    assert client.post("/act", json={}).status_code == 400
+    assert client.post("/act", json={"input": ["x"]}).status_code == 400
+    assert client.post("/act/batch", json={"inputs": "x"}).status_code == 400
+    assert client.post("/act/batch", json={"inputs": ["x", None]}).status_code == 400
+    assert client.get("/agents").get_json() == {"agents": ["ChatAgent"]}
+
+
+def test_batch_length_is_capped():
+    client = create_app({"ChatAgent": ChatAgent}, max_batch=2).test_client()
+
+    assert client.post("/act/batch", json={"inputs": ["a", "b"]}).status_code == 200
+    assert client.post("/act/batch", json={"inputs": ["a", "b", "c"]}).status_code == 400
+
+
+def test_agent_cache_keeps_only_recent_agents():
+    cache = AgentCache({"ChatAgent": ChatAgent}, max_agents=2)
+    first = cache.get("ChatAgent", "a")
+    cache.get("ChatAgent", "b")
+    assert cache.get("ChatAgent", "a") is first
+    cache.get("ChatAgent", "c")  # evicts "b", the least recently used
+
+    assert len(cache) == 2 and cache.get("ChatAgent", "a") is first
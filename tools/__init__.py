@@ -2,5 +2,23 @@
 Expose frequently-used tool functions at package level:
 
 >>> from tools import summarize_text, analyze_sentiment
+
+Names are resolved through :data:`tools.registry.TOOLS` on first access, so
+importing the package does not import any tool module.
 """
-from .nlp import summarize_text, analyze_sentiment  # noqa: F401
+from typing import Any, List
+
+from .registry import TOOLS, get_tool  # noqa: F401
+
+__all__ = ["summarize_text", "analyze_sentiment", "analyze_sentiment_batch", "TOOLS", "get_tool"]
+
+
+def __getattr__(name: str) -> Any:
+    if name.startswith("_") or name not in TOOLS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = TOOLS.get(name)
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(TOOLS.names()))
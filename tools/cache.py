@@ -0,0 +1,301 @@
+"""
+Result cache backends shared by agents and tools.
+
+Every backend implements :class:`CacheBackend` (``get`` / ``put`` /
+``clear`` / ``stats`` / ``len``) and is safe to use from many threads:
+
+* :class:`ResultCache` – in-process LRU with TTL and a memory bound.
+* :class:`SqliteCache` – one file shared by every local process (e.g. all
+  gunicorn workers) and surviving restarts.
+* :class:`DictCache` – unbounded dict, for tests.
+
+Agents plug one in with ``BaseAgent(cache=...)`` (see :mod:`agents.cache`),
+tools with :func:`tools.memo.pure_tool`.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Protocol, Tuple
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+#: Sentinel for ``cache.get(key, MISSING)`` when ``None`` is a valid value.
+MISSING = object()
+_ENTRY_OVERHEAD = 120  # rough per-entry bookkeeping (key, node, tuple)
+
+
+def deep_sizeof(obj: Any) -> int:
+    """``sys.getsizeof`` that also counts the items of tuples, lists, sets and dicts."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(map(deep_sizeof, obj))
+    elif isinstance(obj, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in obj.items())
+    return size
+
+
+class CacheBackend(Protocol):
+    def get(self, key: Hashable, default: Any = None) -> Any: ...
+
+    def put(self, key: Hashable, value: Any) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> Dict[str, Any]: ...
+
+    def __len__(self) -> int: ...
+
+
+class _Counters:
+    """Hit/miss/eviction counters; updates take ``_stats_lock``."""
+
+    hits = misses = evictions = 0
+
+    def __init__(self) -> None:
+        self._stats_lock = threading.Lock()
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _evicted(self, n: int = 1) -> None:
+        with self._stats_lock:
+            self.evictions += n
+
+    def _reset(self) -> None:
+        with self._stats_lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def _stats(self, **extra: Any) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            **extra,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class DictCache(_Counters):
+    """Unbounded, non-expiring dict backend – handy in tests."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.data: Dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        value = self.data.get(key, MISSING)
+        self._count(value is not MISSING)
+        return default if value is MISSING else value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self.data[key] = value
+
+    def clear(self) -> None:
+        """Drop every entry and reset the stats."""
+        self.data.clear()
+        self._reset()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats(entries=len(self.data))
+
+
+class ResultCache(_Counters):
+    """
+    Thread-safe LRU cache with optional TTL and a memory bound.
+
+    :param max_entries: evict least-recently-used entries beyond this count.
+    :param max_bytes: evict until the estimated size (``sizeof`` of key and
+        value plus a fixed overhead) fits; larger entries are not stored.
+    :param ttl: seconds an entry stays valid (``None`` = forever).
+
+    Counters are updated under the cache's own lock.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        max_bytes: Optional[int] = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sizeof: Callable[[Any], int] = deep_sizeof,
+    ) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._sizeof = sizeof
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires, _ = entry
+                if expires is None or expires > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self._sizeof(key) + self._sizeof(value) + _ENTRY_OVERHEAD
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, expires, size)
+            self.bytes += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the stats."""
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats(entries=len(self._data), bytes=self.bytes)
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._data.pop(key)
+        self.bytes -= size
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key BLOB NOT NULL UNIQUE,
+    value,
+    expires REAL
+)
+"""
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class SqliteCache(_Counters):
+    """
+    Cache shared by every local process through one SQLite file (WAL mode,
+    memory-mapped reads).  ``str`` values are stored as TEXT, so the common
+    case needs no encoding; anything else goes through ``dumps`` / ``loads``
+    into a BLOB.  These default to JSON, which cannot execute code when
+    reading a file other processes write to – pass ``pickle.dumps`` /
+    ``pickle.loads`` only if every writer is trusted.  Once ``max_entries``
+    is exceeded the oldest-written entries are pruned (checked every
+    ``prune_every`` puts); ``ttl`` is wall-clock seconds so it holds across
+    processes.  Hit/miss counters are per process.
+    """
+
+    def __init__(
+        self,
+        path: "str | os.PathLike[str]",
+        max_entries: Optional[int] = 1_000_000,
+        ttl: Optional[float] = None,
+        prune_every: int = 1_000,
+        mmap_size: int = 256 * 1024 * 1024,
+        dumps: Callable[[Any], bytes] = _json_dumps,
+        loads: Callable[[bytes], Any] = json.loads,
+    ) -> None:
+        super().__init__()
+        self.path = os.fspath(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self.mmap_size = mmap_size
+        self._dumps, self._loads = dumps, loads
+        self._local = threading.local()
+        self._puts = 0
+        self._db.executescript(_SQLITE_SCHEMA)
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # sqlite3 connections are per thread; each thread opens its own.
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        return db
+
+    def __len__(self) -> int:
+        (count,) = self._db.execute("SELECT count(*) FROM cache").fetchone()
+        return count
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        row = self._db.execute(
+            "SELECT value, expires FROM cache WHERE key = ?", (self._key(key),)
+        ).fetchone()
+        if row is None or (row[1] is not None and row[1] <= time.time()):
+            self._count(False)
+            return default
+        self._count(True)
+        value = row[0]
+        return self._loads(value) if isinstance(value, bytes) else value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        stored = value if isinstance(value, str) else self._dumps(value)
+        expires = None if self.ttl is None else time.time() + self.ttl
+        self._db.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (self._key(key), stored, expires),
+        )
+        with self._stats_lock:
+            self._puts += 1
+            due = self._puts % self.prune_every == 0
+        if due:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop expired entries, then the oldest beyond ``max_entries``."""
+        db = self._db
+        removed = db.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),)).rowcount
+        if self.max_entries is not None:
+            removed += db.execute(
+                "DELETE FROM cache WHERE rowid IN (SELECT rowid FROM cache ORDER BY rowid"
+                " LIMIT max(0, (SELECT count(*) FROM cache) - ?))",
+                (self.max_entries,),
+            ).rowcount
+        self._evicted(max(removed, 0))
+
+    def clear(self) -> None:
+        """Drop every entry (for all processes) and reset this process's stats."""
+        self._db.execute("DELETE FROM cache")
+        self._reset()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats(entries=len(self), path=self.path)
+
+    @staticmethod
+    def _key(key: Hashable) -> bytes:
+        if isinstance(key, bytes):
+            return key
+        return hashlib.blake2b(repr(key).encode("utf-8", "surrogatepass"), digest_size=16).digest()
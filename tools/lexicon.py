@@ -0,0 +1,313 @@
+"""
+Weighted sentiment lexicon.
+
+A :class:`Lexicon` maps terms (single words or short phrases) to a signed
+weight and is compiled once into plain dict lookups, so scoring a text is a
+single tokenisation pass.  Small single-word lexicons (the default one
+included) skip tokenising altogether: their terms are compiled into one
+literal alternation that scans the text without building a string per word,
+and labelling stops at the first hit that makes a text mixed.
+
+By default a text is labelled the way the original keyword rule did: positive
+only if it has positive hits and no negative ones (and vice versa), so mixed
+texts stay neutral.  ``net=True`` opts into labelling by the sign of the
+summed weights instead.
+
+The active lexicon lives in a :class:`LexiconStore`; reloading builds the new
+lexicon off to the side and then swaps one reference, so in-flight calls keep
+scoring against the lexicon they started with and never wait on a reload.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import re
+import threading
+from itertools import repeat
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+POSITIVE_KEYWORDS = frozenset({"good", "great", "awesome", "love", "amazing", "fantastic"})
+NEGATIVE_KEYWORDS = frozenset({"bad", "terrible", "hate", "awful", "worst"})
+
+TOKEN_PATTERN = r"\w+"
+_TOKEN_RE = re.compile(TOKEN_PATTERN)
+_WORD_CHAR = re.compile(r"\w")
+
+# Above this many terms a regex alternation (tried term by term at every
+# position) costs more than tokenising and hashing each word.
+SCAN_MAX_TERMS = 64
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case *text* and split it into word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class Lexicon:
+    """Immutable term → weight table compiled for single-pass scoring."""
+
+    __slots__ = ("_weights", "_max_ngram", "_net", "_fingerprint", "_scan")
+
+    def __init__(self, weights: Mapping[str, float], net: bool = False) -> None:
+        compiled: Dict[str, float] = {}
+        max_ngram = 1
+        for term, weight in weights.items():
+            tokens = tokenize(term)
+            if not tokens or not weight:
+                continue
+            compiled[" ".join(tokens)] = float(weight)
+            max_ngram = max(max_ngram, len(tokens))
+        self._weights = compiled
+        self._max_ngram = max_ngram
+        self._net = bool(net)
+        self._fingerprint: Optional[str] = None
+        self._scan: Optional[Callable[[str], Iterator["re.Match[str]"]]] = None
+        if max_ngram == 1 and 0 < len(compiled) <= SCAN_MAX_TERMS:
+            # Longest first, so a term never shadows a longer one it prefixes.
+            alternation = "|".join(map(re.escape, sorted(compiled, key=len, reverse=True)))
+            self._scan = re.compile(alternation).finditer
+
+    @classmethod
+    def from_keywords(
+        cls, positive: Iterable[str], negative: Iterable[str]
+    ) -> "Lexicon":
+        weights = {term: 1.0 for term in positive}
+        weights.update({term: -1.0 for term in negative})
+        return cls(weights)
+
+    @classmethod
+    def from_file(cls, path: PathLike, net: bool = False) -> "Lexicon":
+        """
+        Load a lexicon from *path*.
+
+        ``.json`` files hold a ``{"term": weight}`` object; anything else is
+        read as one ``term weight`` entry per line (the weight is the last
+        whitespace-separated field, so terms may be phrases).  Blank lines and
+        ``#`` comments are ignored.
+        """
+        with open(path, encoding="utf-8") as fh:
+            if os.fspath(path).endswith(".json"):
+                return cls(json.load(fh), net)
+            weights: Dict[str, float] = {}
+            for lineno, line in enumerate(fh, 1):
+                line = line.split("#", 1)[0].strip()
+                if not line:
+                    continue
+                try:
+                    term, weight = line.rsplit(None, 1)
+                    weights[term] = float(weight)
+                except ValueError:
+                    raise ValueError(
+                        f"{os.fspath(path)}:{lineno}: expected '<term> <weight>', got {line!r}"
+                    ) from None
+        return cls(weights, net)
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def __contains__(self, term: object) -> bool:
+        return isinstance(term, str) and " ".join(tokenize(term)) in self._weights
+
+    @property
+    def max_ngram(self) -> int:
+        return self._max_ngram
+
+    @property
+    def net(self) -> bool:
+        """Label by the sign of the summed weights rather than by polarity."""
+        return self._net
+
+    @property
+    def weights(self) -> Mapping[str, float]:
+        return self._weights
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the compiled table; equal lexicons share it."""
+        if self._fingerprint is None:
+            blob = json.dumps([self._net, sorted(self._weights.items())], separators=(",", ":"))
+            self._fingerprint = hashlib.blake2b(blob.encode(), digest_size=8).hexdigest()
+        return self._fingerprint
+
+    def _hit_weights(self, tokens: List[str]) -> Iterable[float]:
+        weights = self._weights
+        if self._max_ngram == 1:
+            return filter(None, map(weights.get, tokens, repeat(0.0)))
+        return self._phrase_hits(tokens)
+
+    def _phrase_hits(self, tokens: List[str]) -> Iterable[float]:
+        # Greedy longest match so a phrase is not double-counted with its words.
+        weights = self._weights
+        i, n_tokens = 0, len(tokens)
+        while i < n_tokens:
+            for n in range(min(self._max_ngram, n_tokens - i), 0, -1):
+                weight = weights.get(" ".join(tokens[i:i + n]))
+                if weight is not None:
+                    yield weight
+                    i += n
+                    break
+            else:
+                i += 1
+
+    def _scan_hits(self, text: str) -> Iterator[float]:
+        # Matches are literal terms; keep those that are whole tokens.  Without
+        # \b in the pattern the regex engine can skip ahead on the terms' first
+        # characters, and a rejected match can never hide a whole-word one.
+        lowered = text.lower()
+        weights = self._weights
+        is_word = _WORD_CHAR.match
+        for match in self._scan(lowered):  # type: ignore[misc]
+            start, end = match.span()
+            if not ((start and is_word(lowered, start - 1)) or is_word(lowered, end)):
+                yield weights[match.group()]
+
+    @property
+    def scannable(self) -> bool:
+        """Small single-word lexicon: hits are found without tokenising."""
+        return self._scan is not None
+
+    def locate(self, text: str) -> Tuple[List[int], List[float]]:
+        """
+        Offsets into ``text.lower()`` and weights of every hit, grouped by
+        term rather than in text order.  Only for :attr:`scannable` lexicons.
+
+        Each term is searched for on its own with ``str.find``, which skips
+        through long, sparse text (such as a whole batch joined together)
+        far faster than trying the alternation at every position.
+        """
+        if self._scan is None:
+            raise ValueError("locate() needs a scannable lexicon")
+        lowered = text.lower()
+        is_word = _WORD_CHAR.match
+        find = lowered.find
+        offsets: List[int] = []
+        weights: List[float] = []
+        for term, weight in self._weights.items():
+            start = find(term)
+            while start >= 0:
+                end = start + len(term)
+                if not ((start and is_word(lowered, start - 1)) or is_word(lowered, end)):
+                    offsets.append(start)
+                    weights.append(weight)
+                start = find(term, end)
+        return offsets, weights
+
+    def _text_hits(self, text: str) -> Iterable[float]:
+        if self._scan is not None:
+            return self._scan_hits(text)
+        return self._hit_weights(tokenize(text))
+
+    def score_tokens(self, tokens: List[str]) -> float:
+        """Sum the weights of every lexicon hit in an already tokenised text."""
+        return sum(self._hit_weights(tokens))
+
+    def score(self, text: str) -> float:
+        """Net sentiment weight of *text* (> 0 positive, < 0 negative)."""
+        return sum(self._text_hits(text))
+
+    def split_tokens(self, tokens: List[str]) -> Tuple[float, float]:
+        """``(positive total, negative total)`` of the hits in *tokens*."""
+        return _split(self._hit_weights(tokens))
+
+    def polarity_tokens(self, tokens: List[str]) -> int:
+        """``1``, ``-1`` or ``0`` for positive, negative or neutral *tokens*."""
+        positive, negative = self.split_tokens(tokens)
+        return polarity(positive, negative, self._net)
+
+    def polarity(self, text: str) -> int:
+        """:meth:`polarity_tokens` of *text*, stopping early once it is mixed."""
+        if self._net:
+            return polarity(*_split(self._text_hits(text)), True)
+        positive = negative = False
+        for weight in self._text_hits(text):
+            if weight > 0:
+                positive = True
+            else:
+                negative = True
+            if positive and negative:
+                return 0
+        return polarity(positive, negative)
+
+
+def _split(hits: Iterable[float]) -> Tuple[float, float]:
+    positive = negative = 0.0
+    for weight in hits:
+        if weight > 0:
+            positive += weight
+        else:
+            negative += weight
+    return positive, negative
+
+
+def polarity(positive: float, negative: float, net: bool = False) -> int:
+    """Label rule shared by the scalar and vectorised paths."""
+    if net:
+        total = positive + negative
+        return (total > 0) - (total < 0)
+    if positive and not negative:
+        return 1
+    if negative and not positive:
+        return -1
+    return 0
+
+
+DEFAULT_LEXICON = Lexicon.from_keywords(POSITIVE_KEYWORDS, NEGATIVE_KEYWORDS)
+
+
+class LexiconStore:
+    """Holds the active :class:`Lexicon` and swaps it atomically on reload."""
+
+    def __init__(self, lexicon: Lexicon = DEFAULT_LEXICON) -> None:
+        self._lexicon = lexicon
+        self._path: Optional[PathLike] = None
+        self._reload_lock = threading.Lock()  # serialises writers only
+
+    @property
+    def current(self) -> Lexicon:
+        return self._lexicon
+
+    @property
+    def path(self) -> Optional[PathLike]:
+        return self._path
+
+    def set(self, lexicon: Lexicon) -> None:
+        with self._reload_lock:
+            self._lexicon = lexicon
+            self._path = None
+
+    def load(self, path: PathLike, net: Optional[bool] = None) -> Lexicon:
+        """
+        Compile *path* and make it the active lexicon.  *net* defaults to the
+        current lexicon's setting, so :meth:`reload` keeps it.
+        """
+        with self._reload_lock:
+            lexicon = Lexicon.from_file(path, self._lexicon.net if net is None else net)
+            self._lexicon, self._path = lexicon, path
+        return lexicon
+
+    def reload(self) -> Lexicon:
+        """Re-read the file last passed to :meth:`load`."""
+        if self._path is None:
+            raise RuntimeError("No lexicon file has been loaded")
+        return self.load(self._path)
+
+
+_store = LexiconStore()
+
+
+def get_lexicon() -> Lexicon:
+    return _store.current
+
+
+def set_lexicon(lexicon: Lexicon) -> None:
+    _store.set(lexicon)
+
+
+def load_lexicon(path: PathLike, net: Optional[bool] = None) -> Lexicon:
+    return _store.load(path, net)
+
+
+def reload_lexicon() -> Lexicon:
+    return _store.reload()
@@ -0,0 +1,94 @@
+"""
+Memoisation for pure tools.
+
+Decorate a tool whose result depends only on its arguments with
+:func:`pure_tool` and repeated calls are answered from a cache backend (see
+:mod:`tools.cache`) – by default a bounded, thread-safe, size-aware
+:class:`~tools.cache.ResultCache`::
+
+    @pure_tool(key=lambda text, width=100: (text, width))
+    def summarize_text(text, width=100): ...
+
+    summarize_text.cache_info()   # {'entries': ..., 'hits': ..., ...}
+    summarize_text.cache_clear()
+
+A memo miss costs a key, a locked lookup and a sized insert – more than a
+tool that runs in a few microseconds saves on a hit.  Such tools are declared
+with ``enabled=False`` and skip the memo until a caller whose inputs do
+repeat switches it on::
+
+    summarize_text.cache_enable()       # cache_enable(False) turns it off
+
+Every decorated tool is listed in :data:`PURE_TOOLS`; :func:`memo_stats`
+reports all of them at once.
+"""
+from __future__ import annotations
+from functools import update_wrapper
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from .cache import MISSING, CacheBackend, ResultCache
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+PURE_TOOLS: Dict[str, CacheBackend] = {}
+
+
+def pure_tool(
+    func: Optional[F] = None,
+    *,
+    key: Optional[Callable[..., Optional[Hashable]]] = None,
+    cache: Optional[CacheBackend] = None,
+    max_entries: int = 4096,
+    max_bytes: Optional[int] = 16 * 1024 * 1024,
+    enabled: bool = True,
+) -> Any:
+    """
+    Mark *func* as a pure tool and memoise it in *cache* (default: a
+    ``ResultCache(max_entries, max_bytes)`` of its own).
+
+    ``key`` maps the call arguments to a hashable memo key (default: the
+    positional arguments plus sorted keyword arguments).  Returning ``None``
+    bypasses the memo for that call – use it where hashing the input would
+    cost more than recomputing, or to fold hidden state (such as the active
+    lexicon) into the key.  With ``enabled=False`` calls go straight to
+    *func* until ``cache_enable()`` is called on the decorated tool.
+    """
+    def decorate(fn: F) -> F:
+        memo = cache if cache is not None else ResultCache(max_entries, max_bytes)
+        make_key = key or _default_key
+        active = enabled
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not active:
+                return fn(*args, **kwargs)
+            k = make_key(*args, **kwargs)
+            if k is None:
+                return fn(*args, **kwargs)
+            value = memo.get(k, MISSING)
+            if value is MISSING:
+                value = fn(*args, **kwargs)
+                memo.put(k, value)
+            return value
+
+        def cache_enable(on: bool = True) -> None:
+            nonlocal active
+            active = on
+
+        update_wrapper(wrapper, fn)
+        wrapper.cache = memo  # type: ignore[attr-defined]
+        wrapper.cache_info = memo.stats  # type: ignore[attr-defined]
+        wrapper.cache_clear = memo.clear  # type: ignore[attr-defined]
+        wrapper.cache_enable = cache_enable  # type: ignore[attr-defined]
+        PURE_TOOLS[f"{fn.__module__}.{fn.__qualname__}"] = memo
+        return wrapper  # type: ignore[return-value]
+
+    return decorate(func) if func is not None else decorate
+
+
+def memo_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every :func:`pure_tool`, keyed by qualified name."""
+    return {name: memo.stats() for name, memo in PURE_TOOLS.items()}
+
+
+def _default_key(*args: Any, **kwargs: Any) -> Hashable:
+    return (args, tuple(sorted(kwargs.items()))) if kwargs else args
@@ -2,26 +2,210 @@
 Light-weight NLP helpers – NO heavy ML deps,
 kept deliberately simple for demo purposes.
 """
-import re
-from textwrap import shorten
+from functools import lru_cache, partial
+from textwrap import TextWrapper
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 
+from .lexicon import Lexicon, get_lexicon
+from .memo import pure_tool
 
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+TextSource = Union[str, TextIO, Iterable[str]]
+
+POSITIVE_LABEL = "Positive 😀"
+NEGATIVE_LABEL = "Negative 😞"
+NEUTRAL_LABEL = "Neutral 😐"
+
+# The tool memos are off until cache_enable() (a miss costs more than these
+# tools do).  Once on, longer inputs still skip them: hashing them would cost
+# about as much as the tool itself, and caching them would hold large strings
+# alive.
+_MEMO_MAX_LEN = 4096
+
+
+@lru_cache(maxsize=32)
+def _summary_wrapper(width: int) -> TextWrapper:
+    # Same settings textwrap.shorten() uses; one wrapper per width is reused.
+    return TextWrapper(width=width, max_lines=1, placeholder="…")
+
+
+def _prefix_limit(width: int) -> int:
+    # Characters of collapsed text that fully determine the summary: every
+    # chunk the wrapper keeps ends by *width*, and the chunk after it only
+    # matters up to *width* more characters (plus a few of regex lookahead).
+    return 2 * width + 8
+
+
+def _iter_chunks(source: TextSource, size: int) -> Iterator[str]:
+    """Yield *source* (str, text file or iterable of str) in pieces of <= *size*."""
+    if isinstance(source, str):
+        pieces: Iterable[str] = (source,)
+    elif hasattr(source, "read"):
+        pieces = iter(partial(source.read, size), "")
+    else:
+        pieces = source
+    for piece in pieces:
+        if not isinstance(piece, str):
+            raise TypeError(f"expected text, got {type(piece).__name__}")
+        for start in range(0, len(piece), size):
+            yield piece[start:start + size]
+
+
+def _collapsed_prefix(source: TextSource, limit: int) -> str:
+    """
+    ``" ".join(text.split())[:limit]`` for the full text of *source*, reading
+    only as much of it as needed and holding at most ~*limit* + one chunk.
+    """
+    buf = ""
+    for chunk in _iter_chunks(source, max(2 * limit, 256)):
+        buf += chunk
+        collapsed = " ".join(buf.split())
+        if len(collapsed) >= limit:
+            return collapsed[:limit]
+        # Keep one separator so the next chunk doesn't glue onto the last word.
+        if collapsed and buf[-1].isspace():
+            collapsed += " "
+        buf = collapsed
+    return buf.rstrip(" ")
+
+
+def _summarize_collapsed(collapsed: str, width: int) -> str:
+    collapsed = collapsed.rstrip(" ")
+    if 0 < width and len(collapsed) <= width:
+        return collapsed  # fits: shorten() returns collapsed text unchanged
+    return _summary_wrapper(width).fill(collapsed)
+
+
+def _summary_key(text: str, width: int = 100) -> Optional[Tuple[str, int]]:
+    return (text, width) if len(text) <= _MEMO_MAX_LEN else None
+
+
+@pure_tool(key=_summary_key, enabled=False)
 def summarize_text(text: str, width: int = 100) -> str:
-    """Return the first *width* chars + ellipsis."""
-    return shorten(text.replace("\n", " "), width=width, placeholder="…")
+    """
+    Return the first *width* chars + ellipsis.
+
+    Equivalent to ``textwrap.shorten(text, width, placeholder="…")`` but only
+    collapses and wraps the bounded prefix of *text* that can reach the output.
+    """
+    return _summarize_collapsed(_collapsed_prefix(text, _prefix_limit(width)), width)
+
+
+def collapse_whitespace(text: str) -> str:
+    """*text* with each whitespace run turned into one space, ends stripped."""
+    return " ".join(text.split())
+
+
+def summarize_collapsed(collapsed: str, width: int = 100) -> str:
+    """:func:`summarize_text` of text already put through :func:`collapse_whitespace`."""
+    return _summarize_collapsed(collapsed[:_prefix_limit(width)], width)
+
+
+def summarize_stream(source: TextSource, width: int = 100) -> str:
+    """
+    :func:`summarize_text` for a ``str``, text file object or iterable of
+    string chunks.  Stops reading once the summary is decided, so memory and
+    latency stay flat however large the input is.
+    """
+    return _summarize_collapsed(_collapsed_prefix(source, _prefix_limit(width)), width)
+
+
+def summarize_batch(texts: Iterable[str], width: int = 100) -> List[str]:
+    """:func:`summarize_text` for many inputs, sharing one wrapper per width."""
+    limit = _prefix_limit(width)
+    return [_summarize_collapsed(_collapsed_prefix(text, limit), width) for text in texts]
+
+
+_LABELS = (NEUTRAL_LABEL, POSITIVE_LABEL, NEGATIVE_LABEL)  # indexed by polarity
+
+
+def _label(polarity: int) -> str:
+    return _LABELS[polarity]
+
+
+def _sentiment_key(text: str, lexicon: Optional[Lexicon] = None) -> Optional[Tuple[str, str]]:
+    if len(text) > _MEMO_MAX_LEN:
+        return None
+    # Key on the lexicon content so a reload never serves stale labels.
+    return text, (lexicon or get_lexicon()).fingerprint
+
+
+@pure_tool(key=_sentiment_key, enabled=False)
+def analyze_sentiment(text: str, lexicon: Optional[Lexicon] = None) -> str:
+    """
+    Super-naïve rule-based sentiment: Positive/Negative when only one polarity
+    of lexicon term is present, Neutral otherwise (or the sign of the summed
+    weights for a ``net`` lexicon).  Uses the active lexicon (see
+    :mod:`tools.lexicon`) unless one is given.
+    """
+    return _label((lexicon or get_lexicon()).polarity(text))
+
+
+def analyze_sentiment_batch(
+    texts: Iterable[str], lexicon: Optional[Lexicon] = None
+) -> "pd.Series":
+    """
+    :func:`analyze_sentiment` over a list, NumPy array, pandas Series or any
+    other iterable of texts.  Returns a categorical Series aligned with the
+    input (same index and name when a Series is passed); missing values are
+    Neutral.
+
+    With a scannable lexicon (see :meth:`Lexicon.locate`) the whole batch is
+    joined and searched once, term by term, and the hits are summed per row
+    with NumPy; other lexicons label row by row.
+    """
+    import numpy as np  # imported lazily – only batch callers pay for them
+    import pandas as pd
+
+    lex = lexicon or get_lexicon()
+    if isinstance(texts, pd.Series):
+        index, name, rows = texts.index, texts.name, texts.tolist()
+    else:
+        rows = texts.tolist() if isinstance(texts, np.ndarray) else list(texts)
+        index, name = pd.RangeIndex(len(rows)), None
+    values = [text.lower() if isinstance(text, str) else "" for text in rows]
+
+    if lex.scannable:
+        # Row i spans [ends[i-1], ends[i] - 1) of the "\n"-joined batch.
+        ends = np.cumsum(np.fromiter(map(len, values), np.int64, len(values)) + 1)
+        offsets, hits = lex.locate("\n".join(values))
+        row = np.searchsorted(ends, np.asarray(offsets, dtype=np.int64), side="right")
+        weights = np.asarray(hits, dtype=float)
+        positive = np.bincount(row, np.clip(weights, 0, None), minlength=len(values))
+        negative = np.bincount(row, np.clip(weights, None, 0), minlength=len(values))
+        if lex.net:
+            polarity = np.sign(positive + negative).astype(np.int8)
+        else:  # 1 / -1 only when a single polarity is present
+            polarity = (positive > 0).astype(np.int8) - (negative < 0).astype(np.int8)
+    else:
+        polarity = np.fromiter(map(lex.polarity, values), np.int8, len(values))
 
+    labels = pd.Categorical.from_codes(
+        polarity + 1, categories=[NEGATIVE_LABEL, NEUTRAL_LABEL, POSITIVE_LABEL]
+    )
+    return pd.Series(labels, index=index, name=name)
 
-def analyze_sentiment(text: str) -> str:
-    """Super-naïve rule-based sentiment."""
-    lowered = text.lower()
-    positive_keywords = {"good", "great", "awesome", "love", "amazing", "fantastic"}
-    negative_keywords = {"bad", "terrible", "hate", "awful", "worst"}
 
-    pos = any(word in lowered for word in positive_keywords)
-    neg = any(word in lowered for word in negative_keywords)
+def analyze_and_summarize(
+    texts: Iterable[str], width: int = 100, lexicon: Optional[Lexicon] = None
+) -> List[Tuple[str, str]]:
+    """
+    Fused :func:`analyze_sentiment` + :func:`summarize_text` over a batch.
 
-    if pos and not neg:
-        return "Positive 😀"
-    if neg and not pos:
-        return "Negative 😞"
-    return "Neutral 😐"
+    Each text is whitespace-split once; the collapsed text feeds both tools –
+    its prefix becomes the summary and the whole of it is scored.  The
+    lexicon snapshot is resolved once for the batch.
+    Returns ``(sentiment, summary)`` pairs in input order.
+    """
+    lex = lexicon or get_lexicon()
+    limit = _prefix_limit(width)
+    results = []
+    for text in texts:
+        collapsed = " ".join(text.split())
+        results.append((
+            _label(lex.polarity(collapsed)),
+            _summarize_collapsed(collapsed[:limit], width),
+        ))
+    return results
@@ -0,0 +1,137 @@
+"""
+Name → tool registry with lazy imports.
+
+Tools are declared as ``"module:attribute"`` specs and imported on first
+lookup, so ``import tools`` stays cheap however many tool modules exist::
+
+    from tools.registry import TOOLS
+
+    TOOLS.register("shorten", "textwrap:shorten")   # nothing imported yet
+    TOOLS["shorten"]("hello brave new world", 15)   # imports textwrap
+
+Third-party packages can contribute tools through the
+``agents_and_tools.tools`` entry-point group; they are picked up (but still
+not imported) the first time an unknown name is looked up, or by an
+explicit :meth:`ToolRegistry.discover`.
+"""
+from __future__ import annotations
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Union
+import threading
+
+ENTRY_POINT_GROUP = "agents_and_tools.tools"
+
+BUILTIN_TOOLS: Dict[str, str] = {
+    "collapse_whitespace": "tools.nlp:collapse_whitespace",
+    "summarize_text": "tools.nlp:summarize_text",
+    "summarize_collapsed": "tools.nlp:summarize_collapsed",
+    "summarize_stream": "tools.nlp:summarize_stream",
+    "summarize_batch": "tools.nlp:summarize_batch",
+    "analyze_sentiment": "tools.nlp:analyze_sentiment",
+    "analyze_sentiment_batch": "tools.nlp:analyze_sentiment_batch",
+    "analyze_and_summarize": "tools.nlp:analyze_and_summarize",
+}
+
+
+def resolve(spec: str) -> Any:
+    """Import ``"package.module:attr.path"`` and return the attribute."""
+    module, _, attr = spec.partition(":")
+    obj: Any = import_module(module)
+    for part in filter(None, attr.split(".")):
+        obj = getattr(obj, part)
+    return obj
+
+
+class ToolRegistry:
+    """
+    Lazily-resolved mapping of tool names to callables.  Lookups after the
+    first one are a single dict read.
+    """
+
+    def __init__(
+        self,
+        specs: Optional[Mapping[str, str]] = None,
+        group: Optional[str] = ENTRY_POINT_GROUP,
+    ) -> None:
+        self._specs: Dict[str, str] = dict(specs or {})
+        self._loaded: Dict[str, Callable[..., Any]] = {}
+        # Re-entrant: importing a tool module may itself register tools.
+        self._lock = threading.RLock()
+        self.group = group
+        self._discovered = group is None
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._loaded or name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __len__(self) -> int:
+        return len(self.names())
+
+    def __getitem__(self, name: str) -> Callable[..., Any]:
+        return self.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(self._specs.keys() | self._loaded.keys())
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def register(self, name: str, target: Union[str, Callable[..., Any]]) -> None:
+        """Register a ``"module:attr"`` spec (imported lazily) or a callable."""
+        with self._lock:
+            self._loaded.pop(name, None)
+            if isinstance(target, str):
+                self._specs[name] = target
+            else:
+                self._specs.pop(name, None)
+                self._loaded[name] = target
+
+    def tool(self, name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator form of :meth:`register` for callables defined in place."""
+        def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.register(name or func.__name__, func)
+            return func
+
+        return decorate
+
+    def discover(self) -> int:
+        """Add specs from the entry-point group; returns how many were new."""
+        added = 0
+        if self.group is not None:
+            # importlib.metadata is slow to import; only pay for it here.
+            from importlib.metadata import entry_points
+
+            with self._lock:
+                for ep in entry_points(group=self.group):
+                    if ep.name not in self._specs and ep.name not in self._loaded:
+                        self._specs[ep.name] = ep.value
+                        added += 1
+        self._discovered = True
+        return added
+
+    def get(self, name: str) -> Callable[..., Any]:
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        if name not in self._specs and not self._discovered:
+            self.discover()
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            try:
+                spec = self._specs[name]
+            except KeyError:
+                raise KeyError(f"Unknown tool {name!r}") from None
+            func = self._loaded[name] = resolve(spec)
+            return func
+
+
+TOOLS = ToolRegistry(BUILTIN_TOOLS)
+
+
+def get_tool(name: str) -> Callable[..., Any]:
+    """Look *name* up in the default registry, importing it if needed."""
+    return TOOLS.get(name)
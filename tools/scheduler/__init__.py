@@ -0,0 +1,11 @@
+"""
+Tiny cron-like helper. In real life you’d use APScheduler / Celery,
+but this shows how you might grow utilities in the toolkit.
+
+>>> from tools.scheduler import SimpleScheduler
+"""
+from .backends import BACKENDS, HeapBackend, TimingWheelBackend  # noqa: F401
+from .cron import CronExpression, Interval  # noqa: F401
+from .journal import JournalTask, SqliteJournal  # noqa: F401
+from .core import ScheduledEvent, SimpleScheduler, TickReport  # noqa: F401
+from .runners import AsyncSchedulerRunner, ThreadedSchedulerRunner  # noqa: F401
@@ -0,0 +1,219 @@
+"""
+Storage backends for :class:`~tools.scheduler.SimpleScheduler`.
+
+A backend stores events under an integer due-time key (monotonic
+nanoseconds, see :data:`tools.scheduler.core.clock`) and hands back, in
+firing order, those whose key is <= a given "now" key.
+
+* ``"heap"`` – binary min-heap: O(log n) insert and pop, exact ordering.
+* ``"wheel"`` – hierarchical timing wheel: O(1) insert and amortised O(1)
+  expiry, at the cost of rounding due times up to the wheel resolution.
+"""
+from __future__ import annotations
+from heapq import heapify, heappop, heappush
+from itertools import count
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Type
+
+
+class Backend(Protocol):
+    def push(self, key: int, event: Any) -> None: ...
+
+    def push_many(self, entries: List[Tuple[int, Any]]) -> None: ...
+
+    def pop_due(self, now: int) -> List[Any]: ...
+
+    def next_due(self) -> Optional[int]: ...
+
+    def discard(self, event: Any) -> None: ...
+
+
+class HeapBackend:
+    """Min-heap of ``(key, seq, event)``; ties fire in insertion order."""
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[int, int, Any]] = []
+        self._seq = count()
+        self._cancelled = 0
+
+    def push(self, key: int, event: Any) -> None:
+        heappush(self._heap, (key, next(self._seq), event))
+
+    def push_many(self, entries: List[Tuple[int, Any]]) -> None:
+        heap, seq = self._heap, self._seq
+        if len(entries) * len(heap).bit_length() > len(heap) + len(entries):
+            # Cheaper to append everything and re-heapify in O(n).
+            heap.extend((key, next(seq), event) for key, event in entries)
+            heapify(heap)
+        else:
+            for key, event in entries:
+                heappush(heap, (key, next(seq), event))
+
+    def pop_due(self, now: int) -> List[Any]:
+        heap, due = self._heap, []
+        while heap and heap[0][0] <= now:
+            event = heappop(heap)[2]
+            if event.cancelled:
+                self._cancelled -= 1
+            else:
+                due.append(event)
+        return due
+
+    def next_due(self) -> Optional[int]:
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heappop(heap)
+            self._cancelled -= 1
+        return heap[0][0] if heap else None
+
+    def discard(self, event: Any) -> None:
+        # Lazy deletion, with a compaction pass once half the heap is dead.
+        self._cancelled += 1
+        if self._cancelled * 2 > len(self._heap):
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapify(self._heap)
+            self._cancelled = 0
+
+
+_KEY = attrgetter("key")
+
+
+class TimingWheelBackend:
+    """
+    Hierarchical timing wheel with ``levels`` wheels of 256 slots each.
+
+    Keys are bucketed into ticks of ``resolution`` key units (1 ms by
+    default; rounded up, so nothing fires early).  Slots hold the events
+    themselves and ticks are recomputed from ``event.key`` when cascading.
+    Level *l* holds events whose tick differs from the current tick only in
+    digit *l* (base 256); when time reaches a slot it is cascaded down a
+    level, and level-0 slots expire wholesale, sorted by key so events fire
+    in the same order as with the heap backend.  Ticks beyond
+    the top level wait in an overflow heap.  A per-level occupancy bitmask
+    lets :meth:`pop_due` jump straight over empty slots, so advancing time is
+    proportional to the number of non-empty slots passed, not ticks elapsed.
+    """
+
+    BITS = 8
+    SLOTS = 1 << BITS
+    MASK = SLOTS - 1
+
+    def __init__(self, resolution: int = 1_000_000, levels: int = 4, start: int = 0) -> None:
+        if resolution < 1 or levels < 1:
+            raise ValueError("resolution and levels must be >= 1")
+        self.resolution = resolution
+        self.levels = levels
+        self._span = self.BITS * levels
+        self._now = start // resolution
+        self._wheels: List[List[List[Any]]] = [
+            [[] for _ in range(self.SLOTS)] for _ in range(levels)
+        ]
+        self._occupied = [0] * levels
+        self._overflow: List[Tuple[int, int, Any]] = []
+        self._seq = count()
+        self._ready: List[Any] = []
+
+    def push(self, key: int, event: Any) -> None:
+        self._insert(-(-key // self.resolution), event)
+
+    def push_many(self, entries: List[Tuple[int, Any]]) -> None:
+        resolution, insert = self.resolution, self._insert
+        for key, event in entries:
+            insert(-(-key // resolution), event)
+
+    def _insert(self, tick: int, event: Any) -> None:
+        now = self._now
+        if tick <= now:
+            self._ready.append(event)
+            return
+        # The highest base-256 digit in which tick and now differ picks the level.
+        level = ((tick ^ now).bit_length() - 1) // self.BITS
+        if level < self.levels:
+            slot = (tick >> (level * self.BITS)) & self.MASK
+            self._wheels[level][slot].append(event)
+            self._occupied[level] |= 1 << slot
+        else:
+            heappush(self._overflow, (tick, next(self._seq), event))
+
+    def _next_boundary(self) -> Optional[int]:
+        """Earliest tick > now at which some slot (or the overflow) needs work."""
+        now, best = self._now, None
+        for level in range(self.levels):
+            shift = self.BITS * level
+            current = (now >> shift) & self.MASK
+            ahead = self._occupied[level] >> (current + 1)
+            if ahead:
+                slot = current + 1 + ((ahead & -ahead).bit_length() - 1)
+                block = now >> (shift + self.BITS) << (shift + self.BITS)
+                tick = block | (slot << shift)
+                if best is None or tick < best:
+                    best = tick
+        if self._overflow:
+            tick = self._overflow[0][0] >> self._span << self._span
+            tick = max(tick, now + 1)
+            if best is None or tick < best:
+                best = tick
+        return best
+
+    def _advance_to(self, tick: int) -> None:
+        self._now = tick
+        if self._overflow and self._overflow[0][0] >> self._span <= tick >> self._span:
+            overflow = self._overflow
+            while overflow and overflow[0][0] >> self._span <= tick >> self._span:
+                entry_tick, _, event = heappop(overflow)
+                self._insert(entry_tick, event)
+        for level in range(self.levels - 1, -1, -1):
+            slot = (tick >> (self.BITS * level)) & self.MASK
+            if self._occupied[level] >> slot & 1:
+                entries = self._wheels[level][slot]
+                self._wheels[level][slot] = []
+                self._occupied[level] &= ~(1 << slot)
+                resolution = self.resolution
+                for event in entries:
+                    self._insert(-(-event.key // resolution), event)
+
+    def pop_due(self, now: int) -> List[Any]:
+        target = now // self.resolution
+        if target <= self._now and not self._ready:
+            return []
+        while True:
+            boundary = self._next_boundary()
+            if boundary is None or boundary > target:
+                break
+            self._advance_to(boundary)
+        if target > self._now:
+            self._now = target
+        ready, self._ready = self._ready, []
+        # Past-due pushes and same-tick slot mates arrive in push order;
+        # the stable sort restores due order (ties keep push order).
+        ready.sort(key=_KEY)
+        return [event for event in ready if not event.cancelled]
+
+    def next_due(self) -> Optional[int]:
+        """Lower bound on the next due key (exact for events in level 0)."""
+        if any(not event.cancelled for event in self._ready):
+            return self._now * self.resolution
+        boundary = self._next_boundary()
+        return None if boundary is None else boundary * self.resolution
+
+    def discard(self, event: Any) -> None:
+        # Cancelled events stay in their slot and are dropped on expiry.
+        pass
+
+
+BACKENDS: Dict[str, Type[Any]] = {
+    "heap": HeapBackend,
+    "wheel": TimingWheelBackend,
+}
+
+
+def make_backend(backend: Any = "heap", **options: Any) -> Backend:
+    """Instantiate *backend* by name (see :data:`BACKENDS`) or pass one through."""
+    if isinstance(backend, str):
+        try:
+            return BACKENDS[backend](**options)
+        except KeyError:
+            raise ValueError(
+                f"Unknown scheduler backend {backend!r}; choose from {sorted(BACKENDS)}"
+            ) from None
+    return backend
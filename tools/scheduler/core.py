@@ -0,0 +1,449 @@
+"""
+:class:`SimpleScheduler` and the :class:`ScheduledEvent` handles it returns.
+"""
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import asyncio
+import inspect
+import threading
+import time
+
+from .backends import Backend, make_backend
+from .cron import CronExpression, Interval
+from .journal import JournalTask, RecoveredIndex, Row, SqliteJournal, decode_rule, encode_rule, wall_us
+
+#: ``rule(prev_key, now, wall_now) -> next_key``; see :mod:`tools.scheduler.cron`.
+Recurrence = Callable[[int, int, datetime], int]
+
+#: Internal clock.  Keys are integer nanoseconds on this clock, so they are
+#: immune to wall-clock jumps and cheap to compare; ``datetime`` only appears
+#: at the public API boundary.
+clock = time.monotonic_ns
+
+_MICROSECOND = timedelta(microseconds=1)
+_KEY = attrgetter("key")
+
+
+def delay_ns(delay: timedelta) -> int:
+    return delay // _MICROSECOND * 1000
+
+
+def key_to_datetime(key: int) -> datetime:
+    """Wall-clock (UTC) estimate of the monotonic *key*."""
+    return datetime.utcnow() + timedelta(microseconds=(key - clock()) / 1000)
+
+
+class ScheduledEvent:
+    """Handle returned by :meth:`SimpleScheduler.schedule`; call :meth:`cancel` to drop it."""
+
+    __slots__ = ("key", "func", "recurrence", "cancelled", "journal_id", "_scheduler")
+
+    def __init__(
+        self,
+        key: int,
+        func: Callable[[], Any],
+        scheduler: "SimpleScheduler",
+        recurrence: Optional[Recurrence] = None,
+    ) -> None:
+        self.key = key
+        self.func = func
+        self.recurrence = recurrence
+        self.cancelled = False
+        self.journal_id: Optional[int] = None
+        self._scheduler: Optional[SimpleScheduler] = scheduler
+
+    @property
+    def due(self) -> datetime:
+        """When the event is due, as a wall-clock (UTC) ``datetime``."""
+        return key_to_datetime(self.key)
+
+    def cancel(self) -> bool:
+        """
+        Cancel the event (for recurring jobs: all future runs); returns False
+        if it already ran or was cancelled.
+        """
+        scheduler = self._scheduler
+        return scheduler is not None and scheduler._discard(self)
+
+    def __repr__(self) -> str:
+        state = "cancelled" if self.cancelled else "pending" if self._scheduler else "done"
+        return f"<ScheduledEvent due={self.due.isoformat()} {state}>"
+
+
+@dataclass
+class TickReport:
+    """What one :meth:`SimpleScheduler.run_pending` call did."""
+
+    fired: int = 0
+    #: ``(event, exception)`` for every callback that raised.
+    errors: List[Tuple[ScheduledEvent, BaseException]] = field(default_factory=list)
+    #: Events whose callback was still running ``callback_timeout`` seconds
+    #: after it started.
+    timed_out: List[ScheduledEvent] = field(default_factory=list)
+    #: Events whose callback never started because the executor stayed busy
+    #: with timed-out callbacks; one-shot events are requeued for the next
+    #: tick (recurring ones already are).  Not counted in :attr:`fired`.
+    deferred: List[ScheduledEvent] = field(default_factory=list)
+    #: Awaitables returned by coroutine callbacks; the caller must await them.
+    awaitables: List[Awaitable[Any]] = field(default_factory=list)
+    #: Wall time spent in ``run_pending``, in seconds.
+    latency: float = 0.0
+
+
+class _Timed:
+    """Executor-side wrapper recording when a callback starts and finishes."""
+
+    __slots__ = ("func", "dispatch", "index")
+
+    def __init__(self, func: Callable[[], Any], dispatch: "_Dispatch", index: int) -> None:
+        self.func, self.dispatch, self.index = func, dispatch, index
+
+    def __call__(self) -> Any:
+        dispatch = self.dispatch
+        dispatch.starts[self.index] = dispatch.progress = time.monotonic()
+        try:
+            return self.func()
+        finally:
+            dispatch.progress = time.monotonic()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Process pools get the bare callback (see _Dispatch.next_wait).
+        return _unwrap, (self.func,)
+
+
+def _unwrap(func: Callable[[], Any]) -> Callable[[], Any]:
+    return func
+
+
+class _Dispatch:
+    """
+    Callbacks of one tick submitted to an executor.  Each one may run for
+    ``timeout`` seconds from its own start; callbacks still queued are given
+    up on once no callback has started or finished for ``timeout`` seconds
+    (i.e. the executor is wedged by timed-out callbacks).
+    """
+
+    def __init__(self, timeout: Optional[float]) -> None:
+        self.timeout = timeout
+        self.entries: List[Tuple[ScheduledEvent, Future]] = []
+        self.starts: Dict[int, float] = {}
+        self.progress = time.monotonic()
+
+    def next_wait(self) -> Tuple[List[Future], Optional[float]]:
+        """Futures still worth waiting on and for how long (None = no limit)."""
+        pending = [(i, future) for i, (_, future) in enumerate(self.entries) if not future.done()]
+        timeout = self.timeout
+        if not pending or timeout is None:
+            return [future for _, future in pending], None
+        now = time.monotonic()
+        deadlines, queued = [], False
+        for index, future in pending:
+            start = self.starts.get(index)
+            if start is None and future.running():
+                # Process pools can't report the start back; use first sighting.
+                start = self.starts.setdefault(index, now)
+            if start is None:
+                queued = True
+            else:
+                deadlines.append(start + timeout)
+        if queued:
+            deadlines.append(self.progress + timeout)
+        live = [deadline for deadline in deadlines if deadline > now]
+        if not live:
+            return [], None
+        return [future for _, future in pending], min(live) - now
+
+
+class SimpleScheduler:
+    """
+    One-shot and recurring (interval / cron) scheduler.
+
+    Storage is pluggable (see :mod:`tools.scheduler.backends`): the default
+    ``"heap"`` backend fires events strictly by due time, ties in scheduling
+    order; ``"wheel"`` trades millisecond rounding for O(1) insert/expiry at
+    millions of pending events.  Either way :meth:`run_pending` only touches
+    due events, and cancelled events are dropped lazily.  Recurring jobs
+    reuse one event that is re-keyed in place each time it fires.  Due times are kept
+    as integer :func:`time.monotonic_ns` keys, so wall-clock jumps don't
+    reorder or stall events.
+
+    >>> SimpleScheduler(backend="wheel", resolution=1_000_000)  # 1 ms ticks
+    """
+
+    def __init__(
+        self,
+        backend: Any = "heap",
+        *,
+        executor: Optional[Executor] = None,
+        callback_timeout: Optional[float] = None,
+        journal: Optional[SqliteJournal] = None,
+        **backend_options: Any,
+    ) -> None:
+        if isinstance(backend, str) and backend == "wheel":
+            backend_options.setdefault("start", clock())
+        self._backend: Backend = make_backend(backend, **backend_options)
+        self._live = 0
+        self._lock = threading.Lock()
+        self._wakeups: List[Callable[[int], None]] = []
+        self.executor = executor
+        self.callback_timeout = callback_timeout
+        self.journal = journal
+        self._recovered: Optional[RecoveredIndex] = None
+        if journal is not None:
+            self._recovered = RecoveredIndex(journal, clock() - wall_us() * 1000)
+            self._live += len(self._recovered)
+
+    def __len__(self) -> int:
+        return self._live
+
+    def schedule(self, delay: timedelta, func: Callable[[], Any]) -> ScheduledEvent:
+        """
+        Run *func* once *delay* has elapsed.  *func* may be a coroutine
+        function; its coroutine is handed back by :meth:`run_pending`.
+        """
+        return self.schedule_many([(delay, func)])[0]
+
+    def schedule_many(
+        self, items: Iterable[Tuple[timedelta, Callable[[], Any]]]
+    ) -> List[ScheduledEvent]:
+        """
+        Schedule several ``(delay, func)`` pairs at once: the clock is read
+        once, and the batch is stored under a single lock acquisition.
+        """
+        now = clock()
+        return self._add([ScheduledEvent(now + delay_ns(delay), func, self) for delay, func in items])
+
+    def schedule_every(
+        self, interval: timedelta, func: Callable[[], Any], first: Optional[timedelta] = None
+    ) -> ScheduledEvent:
+        """
+        Run *func* every *interval* (first after *first*, default one interval).
+        Runs missed while the scheduler wasn't ticking are coalesced into one.
+        """
+        rule = Interval(interval)
+        key = clock() + (rule.period if first is None else delay_ns(first))
+        return self._add([ScheduledEvent(key, func, self, rule)])[0]
+
+    def schedule_cron(
+        self, expression: Union[str, CronExpression], func: Callable[[], Any]
+    ) -> ScheduledEvent:
+        """Run *func* on a five-field cron schedule (UTC), e.g. ``"*/5 * * * *"``."""
+        rule = CronExpression.parse(expression) if isinstance(expression, str) else expression
+        now = clock()
+        return self._add([ScheduledEvent(rule(now, now, datetime.utcnow()), func, self, rule)])[0]
+
+    def _materialise(self, rows: List[Row]) -> List[ScheduledEvent]:
+        assert self.journal is not None and self._recovered is not None
+        tasks, events = self.journal.tasks, []
+        for journal_id, due_us, name, payload, rule in rows:
+            event = ScheduledEvent(
+                self._recovered.key(due_us), JournalTask(tasks, name, payload), self, decode_rule(rule)
+            )
+            event.journal_id = journal_id
+            events.append(event)
+        return events
+
+    def _journal_rows(self, events: List[ScheduledEvent]) -> List[Tuple[int, int, str, str, Optional[str]]]:
+        assert self.journal is not None
+        now, now_us = clock(), wall_us()
+        return [
+            (event.journal_id, now_us + (event.key - now) // 1000,
+             event.func.name, event.func.payload, encode_rule(event.recurrence))
+            for event in events
+            if event.journal_id is not None
+        ]
+
+    def _add(self, events: List[ScheduledEvent]) -> List[ScheduledEvent]:
+        if not events:
+            return events
+        if self.journal is not None:
+            persistent = [event for event in events if isinstance(event.func, JournalTask)]
+            if persistent:
+                for event, journal_id in zip(persistent, self.journal.allocate_ids(len(persistent))):
+                    event.journal_id = journal_id
+                self.journal.add(self._journal_rows(persistent))
+        with self._lock:
+            self._backend.push_many([(event.key, event) for event in events])
+            self._live += len(events)
+        if self._wakeups:
+            earliest = min(event.key for event in events)
+            for wakeup in self._wakeups:
+                wakeup(earliest)
+        return events
+
+    def add_wakeup(self, callback: Callable[[int], None]) -> None:
+        """Call ``callback(key)`` whenever an event is scheduled (used by runners)."""
+        self._wakeups.append(callback)
+
+    def remove_wakeup(self, callback: Callable[[int], None]) -> None:
+        self._wakeups.remove(callback)
+
+    def next_due(self) -> Optional[datetime]:
+        """Earliest time an event may be due (exact for the heap backend)."""
+        key = self._next_key()
+        return None if key is None else key_to_datetime(key)
+
+    def _next_key(self) -> Optional[int]:
+        with self._lock:
+            key = self._backend.next_due()
+            if self._recovered:
+                recovered = self._recovered.next_key()
+                if key is None or (recovered is not None and recovered < key):
+                    key = recovered
+            return key
+
+    def run_pending(self) -> TickReport:
+        """
+        Fire every due event and report on the tick.  With an executor this
+        blocks until each callback finished or ran for ``callback_timeout``.
+        """
+        started = time.perf_counter()
+        due, report = self._take_due()
+        if self.executor is None:
+            self._run_inline(due, report)
+        else:
+            dispatch = self._submit(due, report)
+            while True:
+                pending, timeout = dispatch.next_wait()
+                if not pending:
+                    break
+                wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            self._settle(dispatch, report)
+        self._finish(due, report, started)
+        return report
+
+    async def arun_pending(self) -> TickReport:
+        """:meth:`run_pending` that awaits executor callbacks instead of blocking the loop."""
+        started = time.perf_counter()
+        due, report = self._take_due()
+        if self.executor is None:
+            self._run_inline(due, report)
+        else:
+            dispatch = self._submit(due, report)
+            waiters: Dict[Future, "asyncio.Future[Any]"] = {}
+            for _, future in dispatch.entries:
+                waiter = waiters[future] = asyncio.wrap_future(future)
+                waiter.add_done_callback(_retrieve)
+            while True:
+                pending, timeout = dispatch.next_wait()
+                if not pending:
+                    break
+                await asyncio.wait(
+                    [waiters[future] for future in pending], timeout=timeout, return_when=FIRST_COMPLETED
+                )
+            self._settle(dispatch, report)
+        self._finish(due, report, started)
+        return report
+
+    def _take_due(self) -> Tuple[List[ScheduledEvent], TickReport]:
+        now = clock()
+        with self._lock:
+            due: List[ScheduledEvent] = self._backend.pop_due(now)
+            if self._recovered:
+                recovered = self._materialise(self._recovered.pop_due(now))
+                if recovered:
+                    # Both runs are already in key order; the sort just merges them.
+                    due.extend(recovered)
+                    due.sort(key=_KEY)
+            recurring = [event for event in due if event.recurrence is not None]
+            if recurring:
+                # Re-key recurring jobs before running them, so a callback can
+                # still cancel its own future runs.
+                wall_now = datetime.utcnow()
+                for event in recurring:
+                    event.key = event.recurrence(event.key, now, wall_now)
+                self._backend.push_many([(event.key, event) for event in recurring])
+            for event in due:
+                if event.recurrence is None:
+                    event._scheduler = None  # fired: cancel() is now a no-op
+            self._live -= len(due) - len(recurring)
+        return due, TickReport(fired=len(due))
+
+    def _finish(self, due: List[ScheduledEvent], report: TickReport, started: float) -> None:
+        if report.deferred:
+            deferred = set(map(id, report.deferred))
+            due = [event for event in due if id(event) not in deferred]
+            report.fired -= len(report.deferred)
+            self._requeue([event for event in report.deferred if event.recurrence is None])
+        if self.journal is not None:
+            self._journal_fired(due)
+        report.latency = time.perf_counter() - started
+
+    def _journal_fired(self, due: List[ScheduledEvent]) -> None:
+        assert self.journal is not None
+        done = [e.journal_id for e in due if e.journal_id is not None and e.recurrence is None]
+        if done:
+            self.journal.remove(done)
+        recurring = [e for e in due if e.journal_id is not None and e.recurrence is not None]
+        if recurring:
+            self.journal.reschedule((row[1], row[0]) for row in self._journal_rows(recurring))
+
+    def _run_inline(self, due: List[ScheduledEvent], report: TickReport) -> None:
+        for index, event in enumerate(due):
+            try:
+                self._collect(event, event.func(), report)
+            except Exception as exc:
+                report.errors.append((event, exc))
+            except BaseException:
+                # KeyboardInterrupt & co: keep the unfired events for later.
+                self._requeue([e for e in due[index + 1:] if e.recurrence is None])
+                raise
+
+    def _submit(self, due: List[ScheduledEvent], report: TickReport) -> _Dispatch:
+        assert self.executor is not None
+        dispatch = _Dispatch(self.callback_timeout)
+        for event in due:
+            try:
+                future = self.executor.submit(_Timed(event.func, dispatch, len(dispatch.entries)))
+            except Exception as exc:  # e.g. executor shut down
+                report.errors.append((event, exc))
+            else:
+                dispatch.entries.append((event, future))
+        return dispatch
+
+    def _settle(self, dispatch: _Dispatch, report: TickReport) -> None:
+        for event, future in dispatch.entries:
+            if not future.done():
+                if future.cancel():  # still queued behind timed-out callbacks
+                    report.deferred.append(event)
+                else:
+                    report.timed_out.append(event)
+            elif future.cancelled():
+                report.deferred.append(event)
+            elif future.exception() is not None:
+                report.errors.append((event, future.exception()))
+            else:
+                self._collect(event, future.result(), report)
+
+    @staticmethod
+    def _collect(event: ScheduledEvent, result: Any, report: TickReport) -> None:
+        if inspect.isawaitable(result):
+            report.awaitables.append(result)
+
+    def _requeue(self, events: List[ScheduledEvent]) -> None:
+        with self._lock:
+            for event in events:
+                event._scheduler = self
+            self._backend.push_many([(event.key, event) for event in events])
+            self._live += len(events)
+
+    def _discard(self, event: ScheduledEvent) -> bool:
+        with self._lock:
+            # Checked under the lock _take_due detaches fired events with.
+            if event.cancelled or event._scheduler is None:
+                return False
+            event.cancelled = True
+            self._live -= 1
+            self._backend.discard(event)
+        if self.journal is not None and event.journal_id is not None:
+            self.journal.remove([event.journal_id])
+        return True
+
+
+def _retrieve(waiter: "asyncio.Future[Any]") -> None:
+    # Timed-out callbacks may fail after nobody awaits them; don't warn.
+    if not waiter.cancelled():
+        waiter.exception()
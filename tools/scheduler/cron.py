@@ -0,0 +1,166 @@
+"""
+Recurrence rules for :class:`~tools.scheduler.SimpleScheduler`.
+
+A recurrence is called as ``rule(prev_key, now, wall_now)`` when its event
+fires and returns the next monotonic key.  :class:`Interval` repeats every
+fixed period; :class:`CronExpression` follows a standard five-field cron
+expression (minute hour day-of-month month day-of-week) evaluated in UTC.
+
+Each cron field is compiled once into a "next allowed value" table, so the
+next fire time is a handful of O(1) lookups, and identical expressions are
+parsed once and shared between jobs.
+"""
+from __future__ import annotations
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTHS = {name: i for i, name in enumerate(
+    "jan feb mar apr may jun jul aug sep oct nov dec".split(), 1)}
+_DAYS = {name: i for i, name in enumerate("sun mon tue wed thu fri sat".split())}
+
+# (name, low, high, aliases) for minute, hour, day-of-month, month, day-of-week
+_FIELDS: List[Tuple[str, int, int, Dict[str, int]]] = [
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, _MONTHS),
+    ("day of week", 0, 7, _DAYS),
+]
+
+
+class Interval:
+    """Fire every *period*, keeping the original phase; missed runs coalesce."""
+
+    __slots__ = ("period",)
+
+    def __init__(self, period: timedelta) -> None:
+        self.period = period // timedelta(microseconds=1) * 1000
+        if self.period <= 0:
+            raise ValueError("interval must be positive")
+
+    def __call__(self, prev_key: int, now: int, wall_now: datetime) -> int:
+        missed = max(0, (now - prev_key) // self.period)
+        return prev_key + (missed + 1) * self.period
+
+    def __repr__(self) -> str:
+        return f"Interval({timedelta(microseconds=self.period // 1000)!r})"
+
+
+def _parse_field(text: str, low: int, high: int, aliases: Dict[str, int], name: str) -> frozenset:
+    def value(token: str) -> int:
+        token = token.lower()
+        number = aliases[token] if token in aliases else int(token)
+        if not low <= number <= high:
+            raise ValueError(f"{name} value {number} out of range {low}-{high}")
+        return number
+
+    allowed = set()
+    for part in text.split(","):
+        base, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"invalid step in {name} field {part!r}")
+        if base == "*":
+            start, stop = low, high
+        elif "-" in base:
+            first, last = base.split("-", 1)
+            start, stop = value(first), value(last)
+        else:
+            start = value(base)
+            stop = high if step_text else start
+        allowed.update(range(start, stop + 1, step))
+    return frozenset(allowed)
+
+
+def _next_table(allowed: frozenset, high: int) -> Tuple[Optional[int], ...]:
+    """``table[v]`` = smallest allowed value >= v, or None."""
+    table: List[Optional[int]] = [None] * (high + 2)
+    upcoming = None
+    for v in range(high, -1, -1):
+        if v in allowed:
+            upcoming = v
+        table[v] = upcoming
+    return tuple(table)
+
+
+class CronExpression:
+    """A parsed five-field cron expression (UTC)."""
+
+    __slots__ = ("expression", "_minutes", "_hours", "_months", "_doms", "_dows", "_day_or")
+
+    def __init__(self, expression: str) -> None:
+        text = _MACROS.get(expression.strip().lower(), expression)
+        parts = text.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron expression needs 5 fields, got {expression!r}")
+        try:
+            minute, hour, dom, month, dow = (
+                _parse_field(part, low, high, aliases, name)
+                for part, (name, low, high, aliases) in zip(parts, _FIELDS)
+            )
+        except ValueError as exc:
+            raise ValueError(f"invalid cron expression {expression!r}: {exc}") from None
+        if 7 in dow:
+            dow = (dow - {7}) | {0}
+        self.expression = expression
+        self._minutes = _next_table(minute, 59)
+        self._hours = _next_table(hour, 23)
+        self._months = _next_table(month, 12)
+        self._doms = dom
+        self._dows = dow
+        # Classic cron: when both day fields are restricted, either may match.
+        self._day_or = parts[2] != "*" and parts[4] != "*"
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def parse(cls, expression: str) -> "CronExpression":
+        """Parse *expression*, sharing the result between identical expressions."""
+        return cls(expression)
+
+    def _day_matches(self, when: datetime) -> bool:
+        dom_ok = when.day in self._doms
+        dow_ok = (when.weekday() + 1) % 7 in self._dows
+        return dom_ok or dow_ok if self._day_or else dom_ok and dow_ok
+
+    def next_after(self, when: datetime) -> datetime:
+        """First matching minute strictly after *when*."""
+        when = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = when.year + 8  # enough for any valid Feb 29 / weekday combination
+        while when.year <= limit:
+            month = self._months[when.month]
+            if month is None:
+                when = datetime(when.year + 1, 1, 1)
+                continue
+            if month != when.month:
+                when = datetime(when.year, month, 1)
+            if not self._day_matches(when):
+                when = datetime(when.year, when.month, when.day) + timedelta(days=1)
+                continue
+            hour = self._hours[when.hour]
+            if hour is None:
+                when = datetime(when.year, when.month, when.day) + timedelta(days=1)
+                continue
+            if hour != when.hour:
+                when = when.replace(hour=hour, minute=0)
+            minute = self._minutes[when.minute]
+            if minute is None:
+                when = when.replace(minute=0) + timedelta(hours=1)
+                continue
+            return when.replace(minute=minute)
+        raise ValueError(f"cron expression {self.expression!r} never fires")
+
+    def __call__(self, prev_key: int, now: int, wall_now: datetime) -> int:
+        return now + (self.next_after(wall_now) - wall_now) // timedelta(microseconds=1) * 1000
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
@@ -0,0 +1,230 @@
+"""
+Crash-safe persistence for :class:`~tools.scheduler.SimpleScheduler`.
+
+Only events whose callback is a :class:`JournalTask` – a named task plus a
+JSON payload, created with :meth:`SqliteJournal.task` – are persisted;
+plain callables stay in memory as before.
+
+>>> journal = SqliteJournal("reminders.db", tasks={"remind": send_reminder})
+>>> sched = SimpleScheduler(journal=journal)          # recovers pending events
+>>> sched.schedule(timedelta(hours=1), journal.task("remind", user_id=42))
+
+Due times are stored as wall-clock epoch microseconds (monotonic keys don't
+survive a reboot).  Recovery is one bulk read of the ``(due, id)`` index,
+packed by SQLite into a single hex string and decoded straight into two
+sorted :class:`array.array` columns – no per-event Python objects.  Events
+are only materialised (task, payload, rule) as they come due.  Events are
+deleted from the journal after their callback has run, so delivery is
+at-least-once across crashes.
+"""
+from __future__ import annotations
+from array import array
+from bisect import bisect_right
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from .cron import CronExpression, Interval
+
+#: (id, due wall-clock µs since epoch, task name, JSON payload, rule)
+Row = Tuple[int, int, str, str, Optional[str]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    due_us INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    rule TEXT
+);
+CREATE INDEX IF NOT EXISTS events_due ON events (due_us, id);
+"""
+_FETCH_CHUNK = 500
+
+
+class JournalTask:
+    """Picklable, persistable callback: ``journal.tasks[name](**payload)``."""
+
+    __slots__ = ("tasks", "name", "payload")
+
+    def __init__(self, tasks: Mapping[str, Callable[..., Any]], name: str, payload: str) -> None:
+        self.tasks = tasks
+        self.name = name
+        self.payload = payload  # JSON text; decoded only when the task runs
+
+    def __call__(self) -> Any:
+        return self.tasks[self.name](**json.loads(self.payload))
+
+    def __repr__(self) -> str:
+        return f"JournalTask({self.name!r}, {self.payload})"
+
+
+def encode_rule(rule: Any) -> Optional[str]:
+    if rule is None:
+        return None
+    if isinstance(rule, Interval):
+        return f"every:{rule.period}"
+    if isinstance(rule, CronExpression):
+        return f"cron:{rule.expression}"
+    raise TypeError(f"cannot persist recurrence {rule!r}")
+
+
+def decode_rule(text: Optional[str]) -> Any:
+    if text is None:
+        return None
+    kind, _, value = text.partition(":")
+    if kind == "every":
+        return Interval(timedelta(microseconds=int(value) // 1000))
+    if kind == "cron":
+        return CronExpression.parse(value)
+    raise ValueError(f"unknown recurrence {text!r} in journal")
+
+
+class SqliteJournal:
+    """
+    SQLite (WAL mode) journal.  Every scheduler batch – a ``schedule_many``
+    call or one tick's worth of fired events – is one transaction.  Every
+    ``compact_every`` writes the WAL is checkpointed back into the database
+    and truncated; :meth:`compact` also reclaims free pages.
+    """
+
+    def __init__(
+        self,
+        path: "str | os.PathLike[str]",
+        tasks: Optional[Mapping[str, Callable[..., Any]]] = None,
+        *,
+        synchronous: str = "NORMAL",
+        compact_every: int = 100_000,
+    ) -> None:
+        self.path = path
+        self.tasks: Dict[str, Callable[..., Any]] = dict(tasks or {})
+        self.compact_every = compact_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.fspath(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={synchronous}")
+        self._db.executescript(_SCHEMA)
+        (last_id,) = self._db.execute("SELECT coalesce(max(id), 0) FROM events").fetchone()
+        self._next_id = last_id + 1
+
+    def register(self, name: str, func: Callable[..., Any]) -> None:
+        self.tasks[name] = func
+
+    def task(self, name: str, **payload: Any) -> JournalTask:
+        """A persistable callback running ``tasks[name](**payload)``."""
+        return JournalTask(self.tasks, name, json.dumps(payload, separators=(",", ":")))
+
+    def allocate_ids(self, count: int) -> range:
+        with self._lock:
+            ids = range(self._next_id, self._next_id + count)
+            self._next_id += count
+        return ids
+
+    def load_index(self) -> Tuple["array[int]", "array[int]"]:
+        """``(due_us, ids)`` of every pending event, sorted by due time."""
+        with self._lock:
+            (packed,) = self._db.execute(
+                "SELECT group_concat(printf('%016x%016x', due_us, id), '')"
+                " FROM (SELECT due_us, id FROM events ORDER BY due_us, id)"
+            ).fetchone()
+        pairs = array("q")
+        if packed:
+            pairs.frombytes(bytes.fromhex(packed))
+            if sys.byteorder == "little":
+                pairs.byteswap()  # printf wrote big-endian hex
+        return pairs[0::2], pairs[1::2]
+
+    def fetch(self, ids: List[int]) -> List[Row]:
+        """Full rows for *ids*, in the order given (missing ids are skipped)."""
+        found: Dict[int, Row] = {}
+        with self._lock:
+            for start in range(0, len(ids), _FETCH_CHUNK):
+                chunk = ids[start:start + _FETCH_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for row in self._db.execute(
+                    f"SELECT id, due_us, task, payload, rule FROM events WHERE id IN ({marks})",
+                    chunk,
+                ):
+                    found[row[0]] = row
+        return [found[i] for i in ids if i in found]
+
+    def add(self, rows: Iterable[Row]) -> None:
+        self._write("INSERT INTO events VALUES (?, ?, ?, ?, ?)", rows)
+
+    def reschedule(self, updates: Iterable[Tuple[int, int]]) -> None:
+        """``(due_us, id)`` pairs for recurring events that were re-keyed."""
+        self._write("UPDATE events SET due_us = ? WHERE id = ?", updates)
+
+    def remove(self, ids: Iterable[int]) -> None:
+        self._write("DELETE FROM events WHERE id = ?", ((i,) for i in ids))
+
+    def _write(self, sql: str, params: Iterable[Any]) -> None:
+        with self._lock:
+            cursor = self._db.cursor()
+            cursor.execute("BEGIN")
+            try:
+                cursor.executemany(sql, params)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            self._writes += max(cursor.rowcount, 1)
+            if self._writes >= self.compact_every:
+                self._writes = 0
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def compact(self) -> None:
+        """Checkpoint and truncate the WAL, then reclaim free pages."""
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._db.execute("VACUUM")
+            self._writes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._db.close()
+
+
+def wall_us() -> int:
+    return time.time_ns() // 1000
+
+
+class RecoveredIndex:
+    """
+    Journal events recovered at start-up but not yet materialised: sorted
+    ``due_us`` / ``id`` columns plus a cursor.  ``offset`` maps wall-clock
+    microseconds onto the scheduler's monotonic nanosecond keys.
+    """
+
+    def __init__(self, journal: SqliteJournal, offset: int) -> None:
+        self.journal = journal
+        self.offset = offset
+        self._due_us, self._ids = journal.load_index()
+        self._cursor = 0
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._cursor
+
+    def key(self, due_us: int) -> int:
+        return due_us * 1000 + self.offset
+
+    def next_key(self) -> Optional[int]:
+        return self.key(self._due_us[self._cursor]) if len(self) else None
+
+    def pop_due(self, now: int) -> List[Row]:
+        """Rows of every recovered event with key <= *now*, in due order."""
+        end = bisect_right(self._due_us, (now - self.offset) // 1000, self._cursor)
+        if end == self._cursor:
+            return []
+        ids = self._ids[self._cursor:end].tolist()
+        self._cursor = end
+        if not len(self):  # fully drained – drop the columns
+            self._due_us, self._ids, self._cursor = array("q"), array("q"), 0
+        return self.journal.fetch(ids)
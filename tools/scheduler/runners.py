@@ -0,0 +1,182 @@
+"""
+Run loops for :class:`~tools.scheduler.SimpleScheduler`.
+
+Both runners sleep until the earliest due time rather than polling, and are
+woken early when something sooner is scheduled (from any thread).  Callback
+errors and timeouts from each tick's report are logged.
+
+>>> runner = AsyncSchedulerRunner(scheduler)
+>>> task = asyncio.create_task(runner.run())      # inside an event loop
+>>> ThreadedSchedulerRunner(scheduler).start()    # or on a daemon thread
+"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Optional, Set
+import asyncio
+import logging
+import threading
+
+from .core import SimpleScheduler, TickReport, clock
+
+logger = logging.getLogger(__name__)
+
+_AWAKE = None  # sentinel wake key: runner is busy, every schedule must signal
+
+
+class _Runner(ABC):
+    """
+    Shared tick logic.  Sub-classes MUST implement the wake-up primitives
+    (:meth:`_signal`, :meth:`_clear`) and how coroutine callbacks run
+    (:meth:`_spawn`).
+    """
+
+    def __init__(self, scheduler: SimpleScheduler) -> None:
+        self.scheduler = scheduler
+        self._wake_key: Optional[float] = _AWAKE
+        self._stopped = False
+
+    def _on_schedule(self, key: int) -> None:
+        wake_key = self._wake_key
+        if wake_key is _AWAKE or key < wake_key:
+            self._signal()
+
+    @abstractmethod
+    def _signal(self) -> None:
+        """Wake the run loop (callable from any thread)."""
+
+    def _begin_tick(self) -> None:
+        self._wake_key = _AWAKE
+        self._clear()
+
+    def _end_tick(self, report: TickReport) -> Optional[float]:
+        """Handle a tick's report, then return seconds to sleep (None = until woken)."""
+        for awaitable in report.awaitables:
+            self._spawn(awaitable)
+        for event, exc in report.errors:
+            logger.error("Scheduled callback %r failed", event, exc_info=exc)
+        if report.timed_out:
+            logger.warning("%d scheduled callbacks exceeded the timeout", len(report.timed_out))
+        if report.deferred:
+            logger.warning("%d scheduled callbacks deferred: executor busy", len(report.deferred))
+        key = self.scheduler._next_key()
+        if key is None:
+            self._wake_key = float("inf")
+            return None
+        self._wake_key = key
+        return max(0.0, (key - clock()) / 1e9)
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Reset the wake-up flag before a tick."""
+
+    @abstractmethod
+    def _spawn(self, awaitable: Awaitable[Any]) -> None:
+        """Run an awaitable returned by a callback."""
+
+
+class AsyncSchedulerRunner(_Runner):
+    """Drive a scheduler from an asyncio loop; coroutine callbacks become tasks."""
+
+    def __init__(self, scheduler: SimpleScheduler) -> None:
+        super().__init__(scheduler)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+
+    async def run(self) -> None:
+        """Run until :meth:`stop` is called (or the task is cancelled)."""
+        self._loop = asyncio.get_running_loop()
+        self._event = asyncio.Event()
+        self._stopped = False
+        self.scheduler.add_wakeup(self._on_schedule)
+        try:
+            while not self._stopped:
+                self._begin_tick()
+                # Awaits executor callbacks rather than blocking the loop.
+                timeout = self._end_tick(await self.scheduler.arun_pending())
+                if self._stopped:
+                    break
+                try:
+                    await asyncio.wait_for(self._event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.scheduler.remove_wakeup(self._on_schedule)
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._signal()
+
+    def _signal(self) -> None:
+        loop, event = self._loop, self._event
+        if loop is None or event is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            event.set()
+        else:
+            loop.call_soon_threadsafe(event.set)
+
+    def _clear(self) -> None:
+        assert self._event is not None
+        self._event.clear()
+
+    def _spawn(self, awaitable: Awaitable[Any]) -> None:
+        task = asyncio.ensure_future(awaitable)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: "asyncio.Task[Any]") -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Scheduled coroutine failed", exc_info=task.exception())
+
+
+class ThreadedSchedulerRunner(_Runner):
+    """Drive a scheduler from a daemon thread; coroutine callbacks are run to completion there."""
+
+    def __init__(self, scheduler: SimpleScheduler, name: str = "scheduler") -> None:
+        super().__init__(scheduler)
+        self._cond = threading.Condition()
+        self._signalled = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> "ThreadedSchedulerRunner":
+        self.scheduler.add_wakeup(self._on_schedule)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped = True
+        self._signal()
+        self._thread.join(timeout)
+        self.scheduler.remove_wakeup(self._on_schedule)
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._begin_tick()
+            timeout = self._end_tick(self.scheduler.run_pending())
+            with self._cond:
+                if not self._signalled and not self._stopped:
+                    self._cond.wait(timeout)
+
+    def _signal(self) -> None:
+        with self._cond:
+            self._signalled = True
+            self._cond.notify()
+
+    def _clear(self) -> None:
+        with self._cond:
+            self._signalled = False
+
+    def _spawn(self, awaitable: Awaitable[Any]) -> None:
+        async def _await() -> Any:
+            return await awaitable
+
+        try:
+            asyncio.run(_await())
+        except Exception:
+            logger.exception("Scheduled coroutine failed")